@@ -1,5 +1,12 @@
+import os
 import streamlit as st
 from app.core.auth import check_session, login_ui, logout_button
+from app.core.cache import invalidate, begin_run, memo_saved_calls
+from app.core.tracing import SHOW_TRACE_PANEL, begin_trace, render_trace_panel
+from app.core.recommendations_cases import recommend_cache_stats
+from app.core.snapshot import built_snapshots
+from app.core.skill_stats import rebuild_skill_stats
+from app.core.slot_index import get_slot_index
 from app.tabs import (
     tab0_profile,
     tab1_analytics,
@@ -9,7 +16,34 @@ from app.tabs import (
 )
 
 st.set_page_config(page_title="HEC Case Club", page_icon="🎓", layout="wide")
+begin_run()
+begin_trace()
 
+VIEWS = {
+    "👤 Profile": tab0_profile,
+    "📊 Analytics": tab1_analytics,
+    "💼 Case Recommendations": tab2_case_recommendations,
+    "🤝 Partner Recommendations": tab3_partner_recommendations,
+    "📝 Feedback Input": tab4_feedback_input,
+}
+
+# Comma-separated emails that get the admin actions (shared rebuilds) in the sidebar
+ADMIN_EMAILS = {e.strip().lower() for e in os.environ.get("HCC_ADMIN_EMAILS", "").split(",") if e.strip()}
+
+# Widget keys owned by the views ("tab2_mode", ...); see keep_view_state()
+VIEW_STATE_PREFIXES = ("tab0_", "tab1_", "tab2_", "tab3_", "tab4_")
+
+
+def keep_view_state():
+    """Keep the widget state of views that are not rendered in this run.
+
+    Streamlit drops the state of widgets that are not drawn during a rerun;
+    re-assigning their keys carries each tab's selections over until the user
+    comes back to it.
+    """
+    for key in list(st.session_state.keys()):
+        if key.startswith(VIEW_STATE_PREFIXES):
+            st.session_state[key] = st.session_state[key]
 
 
 user = check_session()
@@ -24,28 +58,54 @@ else:
     st.sidebar.subheader("⚙️ Settings")
 
     if st.sidebar.button("🔄 Refresh Data"):
-        st.cache_data.clear()
+        # Only this user's own data: the shared catalogs follow their TTLs and
+        # the writes that change them, so other sessions keep their caches
+        invalidate(
+            f"slots:{user.id}", f"appointments:{user.id}", f"feedback:{user.id}",
+            f"pending:{user.id}", f"profile:{user.id}",
+        )
         st.sidebar.success("Data was updated.")
 
-    tabs = st.tabs([
-        "👤 Profile",
-        "📊 Analytics",
-        "💼 Case Recommendations",
-        "🤝 Partner Recommendations",
-        "📝 Feedback Input"
-    ])
-
-    with tabs[0]:
-        tab0_profile.render(user)
+    if (user.email or "").lower() in ADMIN_EMAILS:
+        with st.sidebar.expander("🛠️ Admin", expanded=False):
+            st.caption("Rebuilds shared data for every session.")
+            if st.button("Rebuild skill statistics"):
+                rebuild_skill_stats()
+                st.success("Skill statistics rebuilt from accepted feedback.")
+            if st.button("Reload slot index"):
+                get_slot_index.clear()
+                st.success("Slot index will be reloaded.")
 
-    with tabs[1]:
-        tab1_analytics.render(user)
+    memo_stats = st.sidebar.empty()
+    trace_panel = st.sidebar.container()
 
-    with tabs[2]:
-        tab2_case_recommendations.render(user)
+    # st.tabs executes every tab body on each rerun, so only the selected view renders
+    view = st.radio(
+        "View",
+        list(VIEWS),
+        horizontal=True,
+        key="active_view",
+        label_visibility="collapsed",
+    )
+    st.divider()
 
-    with tabs[3]:
-        tab3_partner_recommendations.render(user)
+    keep_view_state()
+    VIEWS[view].render(user)
 
-    with tabs[4]:
-        tab4_feedback_input.render(user)
+    if SHOW_TRACE_PANEL:
+        memo_stats.caption(f"♻️ {memo_saved_calls()} duplicate lookups saved this run")
+        render_trace_panel(trace_panel)
+        trace_panel.caption(
+            "Case recommendation cache: "
+            + " · ".join(f"{k} {v}" for k, v in recommend_cache_stats().items())
+        )
+        # Only snapshots some view already built; reporting must not load them
+        snapshots = built_snapshots()
+        if snapshots:
+            trace_panel.caption(
+                "Shared snapshots: "
+                + " · ".join(
+                    f"{name} {len(t)} rows, {t.nbytes / 1024:.0f} KiB"
+                    for name, t in sorted(snapshots.items())
+                )
+            )
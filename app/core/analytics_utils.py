@@ -1,9 +1,10 @@
-
 from app.core.db import supabase
 import pandas as pd
-import streamlit as st
+import numpy as np
+from app.core.cache import keyed_cache
+from app.core.skill_stats import ALL_SKILLS, get_skill_stats
 
-@st.cache_data(ttl=600)
+@keyed_cache("feedback:{user_id}", ttl=600)
 def get_user_feedback(user_id: str, status: str = "accepted"):
     """Fetch feedback entries for a user."""
     res = (
@@ -18,38 +19,73 @@ def get_user_feedback(user_id: str, status: str = "accepted"):
 
 
 def feedback_to_dataframe(feedback_data: list):
-    """Convert feedback JSON objects into a clean dataframe."""
+    """Convert feedback JSON objects into a clean dataframe.
+
+    Fixed-schema decoder: ratings are written straight into preallocated
+    float32 columns (NaN where a skill was not rated; unknown skills get a
+    column on first sight) and created_at becomes a datetime64 "Date" column
+    at day precision. Columns follow pd.json_normalize's order.
+    """
     if not feedback_data:
         return pd.DataFrame()
 
-    df = pd.json_normalize(feedback_data)
-    df.columns = [c.replace("skill_scores.", "") for c in df.columns]
-    df.rename(columns={"created_at": "Date"}, inplace=True)
-    df["Date"] = pd.to_datetime(df["Date"]).dt.date
-    return df
+    n = len(feedback_data)
+    scores = {s: np.full(n, np.nan, dtype=np.float32) for s in ALL_SKILLS}
+    seen = {}  # rated skills, in order of first appearance
+    for i, fb in enumerate(feedback_data):
+        for skill, rating in (fb.get("skill_scores") or {}).items():
+            col = scores.get(skill)
+            if col is None:
+                col = scores[skill] = np.full(n, np.nan, dtype=np.float32)
+            seen[skill] = None
+            if rating is not None:
+                col[i] = rating
 
+    data = {}
+    for key in feedback_data[0]:
+        if key == "created_at":
+            dates = pd.to_datetime([fb.get("created_at") for fb in feedback_data], utc=True, format="ISO8601")
+            data["Date"] = dates.tz_localize(None).normalize()
+        elif key != "skill_scores":
+            data[key] = [fb.get(key) for fb in feedback_data]
+    for skill in seen:
+        data[skill] = scores[skill]
+    return pd.DataFrame(data)
 
-def compute_skill_averages(feedback_df: pd.DataFrame):
-    """Compute per-skill averages from a feedback dataframe."""
-    if feedback_df.empty:
-        return {}, []
 
-    # Detect skill columns dynamically
-    skill_cols = [c for c in feedback_df.columns if c not in ["Date", "case_id", "Case"]]
-    skill_avgs = feedback_df[skill_cols].mean().to_dict()
+def get_user_skill_avgs(user_id: str):
+    """User's average rating per skill from accepted feedback (running stats)."""
+    return get_skill_stats().averages(user_id)
 
-    # Fill missing skills with neutral 3.0 to avoid NaNs
-    all_skills = ["Estimation", "Framework", "Brainstorming", "Chart Interpretation", "Numerical Calculations"]
-    for s in all_skills:
-        skill_avgs.setdefault(s, 3.0)
 
-    return skill_avgs, skill_cols
+@keyed_cache("feedback", ttl=600)
+def get_all_skill_avgs() -> pd.DataFrame:
+    """Users × skills table of average ratings from accepted feedback.
 
-@st.cache_data(ttl=600)
-def get_user_skill_avgs(user_id: str):
-    """Compute user's average rating per skill from accepted feedback."""
-    feedback_data = get_user_feedback(user_id)
-    feedback_df = feedback_to_dataframe(feedback_data)
-    skill_avgs, _ = compute_skill_averages(feedback_df)
-    return skill_avgs
+    Indexed by user id. Skills a user was never rated on are NaN, except the
+    standard skills which get the neutral 3.0.
+    """
+    return get_skill_stats().averages_frame()
+
+
+@keyed_cache("feedback", ttl=600)
+def get_feedback_counts() -> pd.Series:
+    """Number of accepted feedback entries received per user, indexed by user id."""
+    return get_skill_stats().feedback_counts()
+
+
+def top_k_indices(scores, k):
+    """Positions of the k highest scores, best first (ties keep input order).
 
+    Same result as a stable descending sort cut at k: every score tied with
+    the k-th is kept as a candidate so the tie-break does not depend on
+    argpartition's arbitrary choice at the boundary.
+    """
+    if k is None or k >= len(scores):
+        idx = np.arange(len(scores))
+    elif k <= 0:
+        return np.arange(0)
+    else:
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        idx = np.arange(len(scores)) if np.isnan(kth) else np.flatnonzero(scores >= kth)
+    return idx[np.lexsort((idx, -scores[idx]))][:k]
@@ -3,12 +3,13 @@
 import streamlit as st
 from supabase import create_client
 from app.core.db import insert_user_if_not_exists
+from app.core.tracing import trace_client
 
 @st.cache_resource
 def get_supabase_client():
     url = st.secrets["supabase"]["url"]
     key = st.secrets["supabase"]["key"]
-    return create_client(url, key)
+    return trace_client(create_client(url, key))
 
 supabase = get_supabase_client()
 
@@ -0,0 +1,172 @@
+# app/core/cache.py
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+import streamlit as st
+
+_lock = threading.Lock()
+
+
+@st.cache_resource
+def _dep_versions() -> dict:
+    """Process-wide version counter per dependency key (shared by all sessions)."""
+    return {}
+
+
+def invalidate(*keys: str):
+    """Invalidate every cached entry that depends on any of the given keys.
+
+    Keys are plain strings such as "users", "slots:<user_id>" or
+    "appointments:<user_id>". Entries not depending on them stay cached.
+    """
+    versions = _dep_versions()
+    with _lock:
+        for key in keys:
+            versions[key] = versions.get(key, 0) + 1
+    # Reads memoized earlier in this run may predate the write
+    st.session_state["_run_memo"] = {}
+
+
+def dep_version(key: str) -> int:
+    """Current version of a dependency key (bumped by every invalidate)."""
+    return _dep_versions().get(key, 0)
+
+
+def _current_versions(keys):
+    versions = _dep_versions()
+    return tuple((k, versions.get(k, 0)) for k in keys)
+
+
+def keyed_cache(*deps: str, ttl: int = 600, resource: bool = False):
+    """Cache a loader like st.cache_data, with entries tied to dependency keys.
+
+    deps are format strings over the loader's arguments, e.g.
+    @keyed_cache("slots:{user_id}", ttl=300). The current version of each key
+    is part of the cache key, so invalidate("slots:42") makes only the entries
+    for user 42 miss; stale entries age out through the TTL.
+
+    With resource=True the value is held with st.cache_resource instead
+    (shared, not copied per call), for read-only objects like indexes.
+    """
+    def decorator(func):
+        sig = inspect.signature(func)
+
+        def cached(*args, dep_versions, **kwargs):
+            return func(*args, **kwargs)
+
+        # Streamlit keys caches by module + qualname, so give each loader its own
+        cached.__module__ = func.__module__
+        cached.__name__ = func.__name__
+        cached.__qualname__ = func.__qualname__
+        cached.__doc__ = func.__doc__
+        cached = (st.cache_resource if resource else st.cache_data)(ttl=ttl)(cached)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            keys = [d.format(**bound.arguments) for d in deps]
+            return cached(*args, dep_versions=_current_versions(keys), **kwargs)
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorator
+
+
+# --- PER-RUN MEMO --- #
+
+def begin_run():
+    """Start a new script run: forget the reads memoized by the previous one."""
+    st.session_state["_run_memo"] = {}
+    st.session_state["_run_memo_saved"] = 0
+
+
+def memo_saved_calls() -> int:
+    """Number of duplicate calls memo_per_run answered in the current run."""
+    return st.session_state.get("_run_memo_saved", 0)
+
+
+def memo_per_run(func):
+    """Deduplicate identical calls within one script run of one session.
+
+    Repeated lookups across tabs and helpers hit the backend once per rerun;
+    keyed_cache / st.cache_data remain responsible for reuse across reruns.
+    Arguments must be hashable.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        memo = st.session_state.setdefault("_run_memo", {})
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        if key in memo:
+            st.session_state["_run_memo_saved"] = memo_saved_calls() + 1
+            return memo[key]
+        value = memo[key] = func(*args, **kwargs)
+        return value
+
+    return wrapper
+
+
+# --- BOUNDED LRU --- #
+
+class LRUCache:
+    """Thread-safe LRU cache with optional TTL and hit/miss/eviction counters."""
+
+    def __init__(self, max_entries: int, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and (self.ttl is None or time.monotonic() - item[0] < self.ttl):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+@st.cache_resource
+def lru_cache(name: str, max_entries: int, ttl: float | None = None) -> LRUCache:
+    """Process-wide LRUCache registered under a name."""
+    return LRUCache(max_entries, ttl)
@@ -1,7 +1,71 @@
 
+import functools
+import hashlib
+import inspect
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+from app.core.cache import lru_cache
+
+# Points per skill line above which the progress series is downsampled (LTTB)
+LINE_POINT_BUDGET = 300
+
+# Serialized figures kept by cached_figure (process-wide, LRU)
+FIGURE_CACHE_MAX_ENTRIES = 128
+
+
+def _fingerprint(value, h):
+    """Feed a stable content hash of a chart input into hasher h."""
+    h.update(type(value).__name__.encode())
+    if isinstance(value, pd.DataFrame):
+        h.update(repr([(str(c), str(t)) for c, t in value.dtypes.items()]).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(str(value.dtype).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(str(value.dtype).encode() + repr(value.shape).encode() + value.tobytes())
+    elif isinstance(value, dict):
+        for k, v in value.items():  # order matters to the chart, so it is hashed too
+            _fingerprint(k, h)
+            _fingerprint(v, h)
+    elif isinstance(value, (list, tuple)):
+        h.update(str(len(value)).encode())
+        for v in value:
+            _fingerprint(v, h)
+    else:
+        h.update(repr(value).encode())
+
+
+def cached_figure(func):
+    """Cache a chart helper's figure under a content hash of its inputs.
+
+    The figure is stored serialized in a bounded LRU shared by all helpers, so
+    unchanged data and mode skip figure construction on reruns. A hit still
+    rebuilds the figure from JSON (a few ms), so only decorate helpers whose
+    construction costs clearly more than that: not radar_chart.
+    """
+    sig = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        h = hashlib.sha1(f"{func.__module__}.{func.__qualname__}".encode())
+        for name, value in bound.arguments.items():
+            h.update(name.encode())
+            _fingerprint(value, h)
+
+        payload = lru_cache("figures", FIGURE_CACHE_MAX_ENTRIES).get_or_compute(
+            h.hexdigest(), lambda: func(*args, **kwargs).to_json()
+        )
+        return pio.from_json(payload, skip_invalid=True)
+
+    return wrapper
+
 
 def radar_chart(skill_avgs: dict):
     """Plotly radar chart for average skill ratings."""
@@ -26,22 +90,60 @@ def radar_chart(skill_avgs: dict):
     return fig
 
 
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out shape-preserving points."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket edges for the points between the (always kept) first and last one
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        nxt_start, nxt_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = x[nxt_start:nxt_end].mean(), y[nxt_start:nxt_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+@st.cache_data(ttl=600, max_entries=256)
+def prepare_performance_series(df: pd.DataFrame, skill_cols: list, point_budget: int = LINE_POINT_BUDGET):
+    """Long-format progress series with both x-axes (Cases, Date) per point.
+
+    Cached on the feedback data, so switching the x-axis mode reuses it.
+    Skills with more than point_budget ratings are downsampled with LTTB.
+    """
+    cases = np.arange(1, len(df) + 1)
+    parts = []
+    for skill in skill_cols:
+        rating = pd.to_numeric(df[skill], errors="coerce").to_numpy(dtype=float)
+        idx = np.arange(len(df))
+        if len(df) > point_budget:
+            idx = idx[~np.isnan(rating)]
+            idx = idx[lttb_indices(cases[idx].astype(float), rating[idx], point_budget)]
+        parts.append(pd.DataFrame({
+            "Cases": cases[idx],
+            "Date": df["Date"].to_numpy()[idx],
+            "Skill": skill,
+            "Rating": rating[idx],
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+
+@cached_figure
 def performance_line_chart(df: pd.DataFrame, skill_cols: list, mode: str = "Number of Cases Practiced"):
     """Line chart showing performance evolution by date or case index."""
-    # Defensive copy
-    df = df.copy()
-    df = df[["Date"] + skill_cols]
+    long_df = prepare_performance_series(df[["Date"] + skill_cols], skill_cols)
 
     # Adjust x-axis
-    if mode == "Number of Cases Practiced":
-        df["Cases"] = range(1, len(df) + 1)
-        x_col = "Cases"
-    else:
-        x_col = "Date"
-
-    # Build long format for Plotly
-    long_df = df.melt(id_vars=x_col, var_name="Skill", value_name="Rating")
-    long_df["Rating"] = pd.to_numeric(long_df["Rating"], errors="coerce")
+    x_col = "Cases" if mode == "Number of Cases Practiced" else "Date"
 
     fig = px.line(
         long_df,
@@ -2,17 +2,34 @@
 
 import streamlit as st
 from supabase import create_client, Client
+from app.core.cache import invalidate, keyed_cache, memo_per_run
+from app.core.tracing import trace_client
 
 @st.cache_resource
 def get_supabase_client() -> Client:
     """Initialize and cache Supabase client"""
     url = st.secrets["supabase"]["url"]
     key = st.secrets["supabase"]["key"]
-    return create_client(url, key)
+    return trace_client(create_client(url, key))
 
 supabase = get_supabase_client()
 
 
+def fetch_all(make_query, page_size: int = 1000):
+    """Fetch every row of a query, paging past the PostgREST row limit."""
+    rows, start = [], 0
+    while True:
+        page = make_query().range(start, start + page_size - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
+
+
+# Profile fields shown and edited in the app
+PROFILE_COLUMNS = "id, email, name, language, experience_level, timezone, firms_applying, bio, availability, linkedin_url"
+
+
 def get_user_by_email(email: str):
     """Return user record by email."""
     res = supabase.table("users").select("*").eq("email", email).execute()
@@ -24,7 +41,7 @@ def insert_user_if_not_exists(auth_user, name: str = None):
     uid = auth_user.id
     email = auth_user.email
 
-    existing = supabase.table("users").select("*").eq("id", uid).execute()
+    existing = supabase.table("users").select(PROFILE_COLUMNS).eq("id", uid).execute()
     if existing.data:
         return existing.data[0]
 
@@ -35,6 +52,7 @@ def insert_user_if_not_exists(auth_user, name: str = None):
         "language": "English"
     }
     supabase.table("users").insert(new_user).execute()
+    invalidate("users", f"profile:{uid}")
     return new_user
 
 
@@ -50,6 +68,7 @@ def insert_feedback(from_user, to_user, case_id, skill_scores, comments):
         "status": "pending"
     }
     supabase.table("feedback").insert(entry).execute()
+    invalidate(f"pending:{to_user}")
 
 
 def get_feedback_for_user(user_id: str, status: str = "accepted"):
@@ -60,13 +79,90 @@ def get_feedback_for_user(user_id: str, status: str = "accepted"):
 
 def update_feedback_status(feedback_id: str, status: str):
     """Accept or reject feedback entry."""
-    supabase.table("feedback").update({"status": status}).eq("id", feedback_id).execute()
-
-def get_user_profile(user_id: str):
-    """Fetch the full user profile."""
-    res = supabase.table("users").select("*").eq("id", user_id).single().execute()
+    update_feedback_statuses([feedback_id], status)
+
+
+def update_feedback_statuses(feedback_ids: list, status: str) -> int:
+    """Accept or reject several feedback entries in one call; returns how many changed."""
+    # imported here: skill_stats itself depends on this module
+    from app.core.skill_stats import record_accepted_feedback
+
+    if not feedback_ids:
+        return 0
+    # neq(status): a repeated click must not be counted twice
+    res = supabase.table("feedback").update({"status": status}).in_("id", list(feedback_ids)).neq("status", status).execute()
+    changed = res.data or []
+    for fb in changed:
+        if status == "accepted":
+            record_accepted_feedback(fb["id"], fb["to_user"], fb.get("skill_scores"))
+    recipients = {fb["to_user"] for fb in changed}
+    if recipients:
+        invalidate("feedback", *(f"feedback:{u}" for u in recipients), *(f"pending:{u}" for u in recipients))
+    return len(changed)
+
+
+@keyed_cache("pending:{user_id}", ttl=300)
+def get_pending_feedback(user_id: str):
+    """Pending feedback for a user, with sender name and case title joined in."""
+    return (
+        supabase.table("feedback")
+        .select("id, from_user, case_id, skill_scores, comments, created_at, sender:from_user(name,email), case:case_id(title)")
+        .eq("to_user", user_id)
+        .eq("status", "pending")
+        .order("created_at")
+        .execute()
+        .data or []
+    )
+
+
+def _search_pattern(query: str) -> str:
+    # commas, parentheses and wildcards would break or change the PostgREST filter
+    cleaned = "".join(ch for ch in (query or "").strip() if ch not in ",()%*")
+    return f"%{cleaned}%"
+
+
+@keyed_cache("users", ttl=600)
+def search_users(query: str = "", limit: int = 20):
+    """Users whose name or email contains the query (first `limit` by name)."""
+    pattern = _search_pattern(query)
+    return (
+        supabase.table("users")
+        .select("id, name, email")
+        .or_(f"name.ilike.{pattern},email.ilike.{pattern}")
+        .order("name")
+        .limit(limit)
+        .execute()
+        .data or []
+    )
+
+
+@keyed_cache("cases", ttl=600)
+def search_cases(query: str = "", limit: int = 20):
+    """Cases whose title contains the query (first `limit` by title)."""
+    return (
+        supabase.table("cases")
+        .select("id, title")
+        .ilike("title", _search_pattern(query))
+        .order("title")
+        .limit(limit)
+        .execute()
+        .data or []
+    )
+
+@memo_per_run
+@keyed_cache("profile:{user_id}", ttl=600)
+def get_user_profile(user_id: str, columns: str = PROFILE_COLUMNS):
+    """Fetch a user's profile, projected to the given columns (e.g. "timezone")."""
+    res = supabase.table("users").select(columns).eq("id", user_id).single().execute()
     return res.data or {}
 
+@memo_per_run
+@keyed_cache("cases", ttl=600)
+def get_case_titles():
+    """Return id and title of every case."""
+    res = supabase.table("cases").select("id, title").execute()
+    return res.data or []
+
 def update_my_profile(user_id: str, payload: dict):
     """Update the current user's profile with validated fields."""
     allowed_keys = {
@@ -77,3 +173,4 @@ def update_my_profile(user_id: str, payload: dict):
     if not clean:
         return
     supabase.table("users").update(clean).eq("id", user_id).execute()
+    invalidate("users", f"profile:{user_id}")
@@ -1,53 +1,173 @@
-from app.core.db import supabase
+from app.core.db import supabase, fetch_all
 import pandas as pd
-from app.core.analytics_utils import get_user_feedback, feedback_to_dataframe, compute_skill_averages
-import streamlit as st
+import numpy as np
+from app.core.analytics_utils import ALL_SKILLS, top_k_indices
+from app.core.cache import keyed_cache, lru_cache, dep_version
+from app.core.snapshot import TableSnapshot
 
-@st.cache_data(ttl=600)
-def get_all_cases():
-    """Fetch all available cases from Supabase."""
-    res = supabase.table("cases").select("*").execute()
-    return res.data or []
+# recommend_cases results: bounded LRU, keyed on averages rounded to this step
+RECOMMEND_CACHE_MAX_ENTRIES = 512
+RECOMMEND_CACHE_RESOLUTION = 0.05
+RECOMMEND_CACHE_TTL = 600
 
+# Column projections: each tab pulls only what it shows
+CASE_SCORING_COLUMNS = "id, case_style, skill_weights"
+CASE_LISTING_COLUMNS = "id, title, difficulty, industry, focus_area, case_style"
+CASE_DETAIL_COLUMNS = "id, description"
 
-def compute_case_score(user_avgs: dict, case: dict, mode: str):
-    """Compute a weighted score for a given case based on user skill averages."""
-    skill_weights = case.get("skill_weights", {}) or {}
+def _columns(*projections):
+    names = [c.strip() for p in projections for c in p.split(",")]
+    return list(dict.fromkeys(names))
 
-    if not skill_weights:
-        return 0
+@keyed_cache("cases", ttl=600, resource=True)
+def get_case_table() -> TableSnapshot:
+    """Process-wide columnar snapshot of the catalog: listing + scoring columns.
 
-    score = 0
-    for skill, weight in skill_weights.items():
-        user_rating = user_avgs.get(skill, 3)
+    Shared by Explore and the scorer; descriptions stay out of it and are
+    fetched per case with get_case_details.
+    """
+    columns = _columns(CASE_LISTING_COLUMNS, CASE_SCORING_COLUMNS)
+    rows = fetch_all(lambda: supabase.table("cases").select(", ".join(columns)).order("id"))
+    return TableSnapshot(rows, columns, name="cases")
 
-        if mode == "fix_weaknesses":
-            # Prefer cases that target low-rated skills
-            score += weight * (5 - user_rating)
-        else:  # build_strengths
-            # Prefer cases that use strong skills
-            score += weight * user_rating
 
-    return score
+@keyed_cache("cases", ttl=600)
+def get_case_details(case_ids: tuple):
+    """Detail columns (e.g. description) of a few cases, fetched when shown."""
+    if not case_ids:
+        return {}
+    res = supabase.table("cases").select(CASE_DETAIL_COLUMNS).in_("id", list(case_ids)).execute()
+    return {c["id"]: c for c in res.data or []}
+
+
+# Explore filters: catalog column -> label
+CASE_FACETS = {
+    "difficulty": "Difficulty",
+    "industry": "Industry",
+    "focus_area": "Focus Area",
+    "case_style": "Case Style",
+}
+
+@keyed_cache("cases", ttl=600, resource=True)
+def get_case_facet_index():
+    """Faceted index over the case catalog for the Explore filters.
+
+    Returns (table, postings, counts): table is the catalog as a DataFrame,
+    postings maps facet -> value -> boolean row mask and counts holds the
+    unfiltered number of cases per facet value. Shared and read-only.
+    """
+    snapshot = get_case_table()
+    table = pd.DataFrame({c: snapshot.column(c) for c in _columns(CASE_LISTING_COLUMNS)}, copy=False)
+    postings, counts = {}, {}
+    for facet in CASE_FACETS:
+        col = table[facet] if facet in table else pd.Series([None] * len(table), dtype=object)
+        codes, values = pd.factorize(col, sort=True)
+        postings[facet] = {v: codes == i for i, v in enumerate(values)}
+        counts[facet] = {v: int(m.sum()) for v, m in postings[facet].items()}
+        for m in postings[facet].values():
+            m.setflags(write=False)
+    return table, postings, counts
+
+
+def match_cases(index, selections: dict, skip: str | None = None):
+    """Boolean row mask of the cases matching every selected facet value.
+
+    selections maps facet -> value (None/"All" = no filter); the facet named
+    by skip is ignored, which gives the base for that facet's live counts.
+    """
+    table, postings, _ = index
+    mask = np.ones(len(table), dtype=bool)
+    for facet, value in selections.items():
+        if facet == skip or value in (None, "All"):
+            continue
+        mask = mask & postings[facet].get(value, False)
+    return mask
+
+
+def facet_counts(index, selections: dict, facet: str) -> dict:
+    """Per-value counts of a facet given the other facets' selections."""
+    _, postings, counts = index
+    others = {f: v for f, v in selections.items() if f != facet and v not in (None, "All")}
+    if not others:
+        return counts[facet]
+    base = match_cases(index, others)
+    return {v: int(np.count_nonzero(base & m)) for v, m in postings[facet].items()}
+
+
+@keyed_cache("cases", ttl=600, resource=True)
+def get_case_index():
+    """Scoring index over the case catalog, built once per catalog refresh.
+
+    Returns (cases, skills, weights, style_masks): cases is the shared
+    catalog snapshot, weights a read-only cases × skills matrix (0 where a
+    case does not use a skill) and style_masks maps each case_style to a
+    boolean row mask.
+    """
+    cases = get_case_table()
+    skill_weights = [w or {} for w in cases.column("skill_weights")]
+    extra = {s for w in skill_weights for s in w if s not in ALL_SKILLS}
+    skills = ALL_SKILLS + sorted(extra)
+
+    weights = np.array(
+        [[float(w.get(s, 0)) for s in skills] for w in skill_weights],
+        dtype=float,
+    ).reshape(len(cases), len(skills))
+    styles = cases.column("case_style")
+    style_masks = {style: styles == style for style in set(styles) if style is not None}
+
+    weights.setflags(write=False)
+    for mask in style_masks.values():
+        mask.setflags(write=False)
+    return cases, skills, weights, style_masks
+
+
+def _recommend_cache():
+    return lru_cache("recommend_cases", RECOMMEND_CACHE_MAX_ENTRIES, RECOMMEND_CACHE_TTL)
+
+
+def recommend_cache_stats() -> dict:
+    """Hit/miss/eviction counters of the recommend_cases cache."""
+    return _recommend_cache().stats()
+
 
-@st.cache_data(ttl=600)
 def recommend_cases(user_avgs: dict, mode: str = "fix_weaknesses", top_n: int = 5, pref_style: str | None = None):
-    """Recommend top N cases for the user given their strengths or weaknesses."""
-    cases = get_all_cases()
-    if not cases:
+    """Recommend top N cases for the user given their strengths or weaknesses.
+
+    Averages are quantized to RECOMMEND_CACHE_RESOLUTION over the index's skill
+    order, so users with near-identical profiles share one cache entry.
+    """
+    index = get_case_index()
+    skills = index[1]
+    steps = tuple(round(user_avgs.get(s, 3) / RECOMMEND_CACHE_RESOLUTION) for s in skills)
+    key = (dep_version("cases"), steps, mode, top_n, pref_style)
+
+    recs = _recommend_cache().get_or_compute(
+        key,
+        lambda: _score_cases(index, [q * RECOMMEND_CACHE_RESOLUTION for q in steps], mode, top_n, pref_style),
+    )
+    return [dict(c) for c in recs]
+
+
+def _score_cases(index, ratings, mode, top_n, pref_style):
+    """Top N cases for a rating vector aligned with the index's skills."""
+    cases, skills, weights, style_masks = index
+    if not len(cases):
         return []
 
     # --- Strict filter by preferred style ---
     if pref_style:
-        cases = [c for c in cases if c.get("case_style") == pref_style]
+        rows = np.flatnonzero(style_masks.get(pref_style, np.zeros(len(cases), dtype=bool)))
+    else:
+        rows = np.arange(len(cases))
 
-    if not cases:
+    if not len(rows):
         return []
 
-    # --- Compute scores and sort ---
-    for c in cases:
-        c["score"] = compute_case_score(user_avgs, c, mode)
-
-    sorted_cases = sorted(cases, key=lambda x: x["score"], reverse=True)
-    return sorted_cases[:top_n]
+    # --- Score all candidates at once: sum of weight * (5 - rating) or weight * rating ---
+    ratings = np.asarray(ratings, dtype=float)
+    target = 5 - ratings if mode == "fix_weaknesses" else ratings
+    scores = weights[rows] @ target
 
+    # Materialize only the winners; the shared snapshot is never mutated
+    top = top_k_indices(scores, top_n)
+    return [{**row, "score": float(scores[i])} for row, i in zip(cases.rows(rows[top]), top)]
@@ -1,81 +1,202 @@
 # app/core/recommendations_partners.py
 
-from app.core.db import supabase
-from app.core.analytics_utils import get_user_skill_avgs
+from app.core.db import supabase, fetch_all
+from app.core.analytics_utils import ALL_SKILLS, get_all_skill_avgs, get_feedback_counts, top_k_indices
 import pandas as pd
 import numpy as np
-import streamlit as st
-
-@st.cache_data(ttl=600)
-def get_all_users(exclude_user_id=None):
-    res = supabase.table("users").select(
-        "id, name, email, language, experience_level, firms_applying, bio, availability, timezone, linkedin_url, created_at"
-    ).execute()
-    users = res.data or []
+from app.core.cache import keyed_cache
+from app.core.snapshot import TableSnapshot
+
+USER_COLUMNS = "id, name, email, language, experience_level, firms_applying, bio, availability, timezone, linkedin_url, created_at"
+
+@keyed_cache("users", ttl=600, resource=True)
+def get_user_table() -> TableSnapshot:
+    """Process-wide columnar snapshot of the users table (USER_COLUMNS).
+
+    One shared copy for all sessions; exclude the viewer with a mask over
+    it rather than caching a per-user list.
+    """
+    rows = fetch_all(lambda: supabase.table("users").select(USER_COLUMNS).order("id"))
+    return TableSnapshot(rows, [c.strip() for c in USER_COLUMNS.split(",")], name="users")
+
+
+@keyed_cache("users", ttl=600, resource=True)
+def get_user_snapshot():
+    """Slim read-only view of the users snapshot for the Explore filters.
+
+    Holds the id / language / experience_level arrays (shared with
+    get_user_table, not copied), the sorted language list, the firms
+    vocabulary, firm_masks: one packed uint64 bitmask row per user over
+    that vocabulary (64 firms per word), and newest: row positions ordered
+    by (created_at, id) descending for paging. Built once per refresh.
+    """
+    table = get_user_table()
+    firms_col = table.column("firms_applying")
+    firms = sorted({f for fs in firms_col for f in (fs or [])})
+    firm_bit = {f: i for i, f in enumerate(firms)}
+
+    masks = np.zeros((len(table), max(1, -(-len(firms) // 64))), dtype=np.uint64)
+    for i, fs in enumerate(firms_col):
+        for f in fs or []:
+            bit = firm_bit[f]
+            masks[i, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+    masks.setflags(write=False)
+
+    created = np.array([c or "" for c in table.column("created_at")], dtype=object)
+    newest = np.lexsort((table.column("id").astype(str), created))[::-1].copy()
+    newest.setflags(write=False)
+
+    return {
+        "id": table.column("id"),
+        "language": table.column("language"),
+        "experience_level": table.column("experience_level"),
+        "languages": sorted({v for v in table.column("language") if v}),
+        "firms": firms,
+        "firm_bit": firm_bit,
+        "firm_masks": masks,
+        "newest": newest,
+    }
+
+
+def match_users(snapshot, exclude_user_id=None, language=None, experience_level=None, firms=()):
+    """Boolean mask over the snapshot's users matching the Explore filters.
+
+    The firms filter ("must include all") is a single vectorized
+    (mask & query) == query over the packed firm bitmasks.
+    """
+    match = np.ones(len(snapshot["id"]), dtype=bool)
     if exclude_user_id:
-        users = [u for u in users if u["id"] != exclude_user_id]
-    return users
-
-
-
-def get_user_case_count(user_id):
-    """Count how many accepted feedbacks this user has received."""
-    res = (
-        supabase.table("feedback")
-        .select("id", count="exact")
-        .eq("to_user", user_id)
-        .eq("status", "accepted")
-        .execute()
-    )
-    return res.count or 0
-
-
-def compute_similarity(user_a_skills, user_b_skills):
-    """Compute similarity between two users' skill vectors."""
-    skills = list(set(user_a_skills.keys()) | set(user_b_skills.keys()))
-    a = np.array([user_a_skills.get(s, 3) for s in skills])
-    b = np.array([user_b_skills.get(s, 3) for s in skills])
-
-    # cosine similarity (1 = identical)
-    num = np.dot(a, b)
-    denom = np.linalg.norm(a) * np.linalg.norm(b)
-    return float(num / denom) if denom else 0.0
-
-
-def compute_complementarity(user_a_skills, user_b_skills):
-    """Compute how much user B complements user A's weaknesses."""
-    skills = list(set(user_a_skills.keys()) | set(user_b_skills.keys()))
-    complement = 0
-    for s in skills:
-        a = user_a_skills.get(s, 3)
-        b = user_b_skills.get(s, 3)
-        complement += (5 - a) * b  # high if A is weak and B is strong
-    return complement / len(skills)
-
-@st.cache_data(ttl=600)
-def recommend_partners(current_user_id, mode="similar"):
-    """Return a ranked list of recommended partners."""
-    current_avgs = get_user_skill_avgs(current_user_id)
-    if not current_avgs:
+        match &= snapshot["id"] != exclude_user_id
+    if language:
+        match &= snapshot["language"] == language
+    if experience_level:
+        match &= snapshot["experience_level"] == experience_level
+    if firms:
+        if any(f not in snapshot["firm_bit"] for f in firms):
+            return np.zeros_like(match)
+        query = np.zeros(snapshot["firm_masks"].shape[1], dtype=np.uint64)
+        for f in firms:
+            bit = snapshot["firm_bit"][f]
+            query[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        match &= ((snapshot["firm_masks"] & query) == query).all(axis=1)
+    return match
+
+
+def get_users_page(
+    exclude_user_id=None,
+    language=None,
+    experience_level=None,
+    firms=(),
+    before=None,
+    page_size=10,
+):
+    """One page of matching users, newest first, sliced from the shared snapshot.
+
+    Keyset pagination on (created_at, id): pass the cursor of the previous
+    page's last row as before. Returns (rows, next_cursor) where next_cursor
+    is None on the last page. Only the page's rows are materialized; use
+    match_users for the total match count.
+    """
+    snapshot, table = get_user_snapshot(), get_user_table()
+    order = snapshot["newest"]
+    order = order[match_users(snapshot, exclude_user_id, language, experience_level, firms)[order]]
+    if before:
+        created_at, uid = before
+        created = np.array([c or "" for c in table.column("created_at")[order]], dtype=object)
+        ids = table.column("id")[order].astype(str)
+        order = order[(created < created_at) | ((created == created_at) & (ids < str(uid)))]
+
+    rows = table.rows(order[:page_size])
+    next_cursor = None
+    if len(order) > page_size:
+        next_cursor = (rows[-1]["created_at"], rows[-1]["id"])
+    return rows, next_cursor
+
+
+@keyed_cache("feedback", ttl=600, resource=True)
+def get_skill_matrix():
+    """Dense users × skills rating matrix with a fixed skill column order.
+
+    Returns (user_ids, skills, values, rated, case_counts): values holds the
+    averages with unrated skills set to the neutral 3, rated marks which
+    entries came from actual feedback and case_counts is each row's number of
+    accepted feedbacks. Arrays are shared across sessions and read-only.
+    """
+    avgs = get_all_skill_avgs()
+    skills = ALL_SKILLS + sorted(c for c in avgs.columns if c not in ALL_SKILLS)
+    frame = avgs.reindex(columns=skills)
+
+    user_ids = pd.Index(frame.index)
+    rated = frame.notna().to_numpy()
+    values = frame.fillna(3.0).to_numpy(dtype=float)
+    case_counts = get_feedback_counts().reindex(user_ids, fill_value=0).to_numpy(dtype=int)
+    for arr in (rated, values, case_counts):
+        arr.setflags(write=False)
+    return user_ids, skills, values, rated, case_counts
+
+
+def score_candidates(values, rated, current, current_rated, mode="similar", case_counts=None):
+    """Score every candidate row against the current user's skill vector.
+
+    similar: cosine similarity of the two skill vectors + 0.05 * case_count;
+    complement: mean over skills of (5 - own rating) * candidate rating. Each
+    pair is compared over the union of the skills either user was rated on,
+    missing ratings counting as 3 (tests/test_partner_scoring.py checks this
+    against the pairwise formulas).
+    """
+    union = (rated | current_rated).astype(float)
+    masked = values * union
+
+    if mode == "similar":
+        num = masked @ current
+        denom = np.sqrt(union @ current ** 2) * np.sqrt((masked * values).sum(axis=1))
+        scores = np.divide(num, denom, out=np.zeros_like(num), where=denom != 0)
+        if case_counts is not None:
+            scores = scores + 0.05 * case_counts
+        return scores
+
+    # complement mode
+    return (masked @ (5 - current)) / union.sum(axis=1)
+
+
+@keyed_cache("feedback", "users", ttl=600)
+def recommend_partners(current_user_id, mode="similar", top_k=5):
+    """Return the top ranked recommended partners."""
+    user_ids, skills, values, rated, all_case_counts = get_skill_matrix()
+    if current_user_id not in user_ids:
         return []
 
-    users = get_all_users(exclude_user_id=current_user_id)
-    recs = []
+    me = user_ids.get_loc(current_user_id)
+    current, current_rated = values[me], rated[me]
 
-    for u in users:
-        u_avgs = get_user_skill_avgs(u["id"])
-        if not u_avgs:
-            continue
-
-        case_count = get_user_case_count(u["id"])
-
-        if mode == "similar":
-            score = compute_similarity(current_avgs, u_avgs) + 0.05 * case_count
-        else:  # complement mode
-            score = compute_complementarity(current_avgs, u_avgs)
+    # Only users with accepted feedback (a row in the matrix) are candidates;
+    # the viewer is excluded by mask, the shared snapshot is never copied
+    table = get_user_table()
+    rows = user_ids.get_indexer(table.column("id"))
+    candidates = np.flatnonzero((rows >= 0) & (table.column("id") != current_user_id))
+    if not len(candidates):
+        return []
+    rows = rows[candidates]
 
-        u["score"] = score
-        u["case_count"] = case_count
-        recs.append(u)
+    case_counts = all_case_counts[rows]
+    scores = score_candidates(
+        values[rows], rated[rows], current, current_rated, mode,
+        case_counts=case_counts,
+    )
 
-    return sorted(recs, key=lambda x: x["score"], reverse=True)
+    top = top_k_indices(scores, top_k)
+    recs = table.rows(candidates[top])
+    for u, i in zip(recs, top):
+        u["score"] = float(scores[i])
+        u["case_count"] = int(case_counts[i])
+    return recs
+
+
+def apply_availability_bonus(recs, windows: dict, bonus: float = 0.1, top_k=None):
+    """Re-rank recommendations, adding bonus to partners with a common open window."""
+    ranked = [
+        {**u, "score": u["score"] + (bonus if windows.get(u["id"]) else 0.0)}
+        for u in recs
+    ]
+    ranked.sort(key=lambda u: u["score"], reverse=True)
+    return ranked[:top_k] if top_k else ranked
@@ -1,97 +1,171 @@
 # app/core/scheduling.py
-from datetime import datetime, date, time, timedelta
-from zoneinfo import ZoneInfo
-from typing import List, Dict, Optional
+from datetime import datetime, date, time, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
 from app.core.db import supabase
+from app.core.cache import keyed_cache, invalidate
+from app.core.slot_index import get_slot_index
+from app.core.slot_display import get_zone
 import streamlit as st
 
 SLOT_MINUTES = 90
 
 def _to_utc(dt_local: datetime, tz_str: str) -> datetime:
     """Assumes dt_local naive in user's tz; returns aware UTC."""
-    tz = ZoneInfo(tz_str or "Europe/Paris")
-    return dt_local.replace(tzinfo=tz).astimezone(ZoneInfo("UTC"))
+    return dt_local.replace(tzinfo=get_zone(tz_str)).astimezone(timezone.utc)
 
-@st.cache_data(ttl=300)
+@keyed_cache("slots:{user_id}", ttl=300)
 def get_slots_for_user(user_id: str, include_booked: bool = False):
     q = supabase.table("availability_slots").select("*").eq("user_id", user_id)
     if not include_booked:
         q = q.eq("is_booked", False)
     return q.order("start_ts", desc=False).execute().data or []
 
-@st.cache_data(ttl=300)
 def get_bookable_slots_for_host(host_id: str, now_utc: Optional[datetime] = None):
-    now_utc = now_utc or datetime.utcnow()
-    return (
-        supabase.table("availability_slots")
-        .select("*")
-        .eq("user_id", host_id)
-        .eq("is_booked", False)
-        .gte("start_ts", now_utc.isoformat() + "Z")
-        .order("start_ts", desc=False)
-        .execute()
-        .data or []
-    )
+    """Open future slots of a host, served from the shared slot index."""
+    return get_slot_index().for_host(host_id, now_utc)
+
+def next_open_slots(host_ids: List[str], n: int = 5) -> List[Dict]:
+    """The next n open slots across several hosts, without a query per host."""
+    return get_slot_index().next_open(host_ids, n)
+
+def mutual_availability(user_id: str, partner_ids: List[str]) -> Dict[str, List[Dict]]:
+    """Common open windows of the user and each partner (see SlotIndex.mutual_windows)."""
+    return get_slot_index().mutual_windows(user_id, partner_ids)
+
+def recurring_starts(weekdays: List[int], start_time: time, weeks: int, first_day: Optional[date] = None) -> List[datetime]:
+    """Local start datetimes for a weekly pattern, e.g. weekdays 0-4 at 19:00 for 4 weeks."""
+    first_day = first_day or date.today()
+    days = (first_day + timedelta(days=i) for i in range(7 * weeks))
+    return [datetime.combine(d, start_time) for d in days if d.weekday() in set(weekdays)]
 
-def add_slots(user_id: str, starts_local: List[datetime], tz_str: str):
-    """Create 90-min slots from given local datetimes."""
-    rows = []
-    for dt in starts_local:
-        start_utc = _to_utc(dt, tz_str)
-        rows.append({"start_ts": start_utc.isoformat()})  # ⟵ only start_ts
+def summarize_outcomes(outcomes: List[Dict]) -> Dict[str, int]:
+    """Count per-row outcomes: created / duplicate / overlap / past."""
+    summary = {"created": 0, "duplicate": 0, "overlap": 0, "past": 0}
+    for o in outcomes:
+        summary[o["outcome"]] = summary.get(o["outcome"], 0) + 1
+    return summary
 
-    if not rows:
-        st.info("Select at least one date and time.")
-        return
+def add_slots(user_id: str, starts_local: List[datetime], tz_str: str) -> List[Dict]:
+    """Create 90-min slots from local datetimes in one round trip.
+
+    The create_availability_slots RPC skips starts already taken
+    ("duplicate"), overlapping an existing slot ("overlap") or in the past
+    ("past"). Returns one {start_ts, outcome, slot_id} row per distinct start.
+    """
+    starts_utc = sorted({_to_utc(dt, tz_str).isoformat() for dt in starts_local})
+    if not starts_utc:
+        return []
 
     try:
-        supabase.table("availability_slots").insert(rows).execute()
+        res = supabase.rpc(
+            "create_availability_slots",
+            {"p_user_id": user_id, "p_starts": starts_utc, "p_minutes": SLOT_MINUTES},
+        ).execute()
     except Exception as e:
         st.error(f"Failed to add slots. {type(e).__name__}: {getattr(e, 'args', [''])[0]}")
         raise
-    finally:
-        st.cache_data.clear()
+    outcomes = res.data or []
+
+    created = [
+        {
+            "id": o["slot_id"],
+            "user_id": user_id,
+            "start_ts": o["start_ts"],
+            "end_ts": (datetime.fromisoformat(o["start_ts"].replace("Z", "+00:00")) + timedelta(minutes=SLOT_MINUTES)).isoformat(),
+            "is_booked": False,
+        }
+        for o in outcomes if o["outcome"] == "created"
+    ]
+    if created:
+        get_slot_index().add(created)
+        invalidate(f"slots:{user_id}")
+    return outcomes
+
+def add_recurring_slots(user_id: str, weekdays: List[int], start_time: time, weeks: int, tz_str: str) -> List[Dict]:
+    """Create a weekly recurring pattern of slots (see recurring_starts)."""
+    return add_slots(user_id, recurring_starts(weekdays, start_time, weeks), tz_str)
+
+def delete_slots(slot_ids: List[str], user_id: str) -> int:
+    """Delete several of the user's slots in one round trip; returns how many went."""
+    if not slot_ids:
+        return 0
+    res = supabase.table("availability_slots").delete().in_("id", list(slot_ids)).eq("user_id", user_id).execute()
+    deleted = [r["id"] for r in res.data or []]
+    if deleted:
+        get_slot_index().remove(deleted)
+        invalidate(f"slots:{user_id}")
+    return len(deleted)
 
 def delete_slot(slot_id: str, user_id: str):
-    supabase.table("availability_slots").delete().eq("id", slot_id).eq("user_id", user_id).execute()
-    st.cache_data.clear()
+    delete_slots([slot_id], user_id)
 
-def _mark_slot_booked(slot_id: str) -> bool:
-    # try to atomically mark booked; if already booked, no row returns
-    res = supabase.table("availability_slots").update({"is_booked": True}).eq("id", slot_id).eq("is_booked", False).execute()
-    return bool(res.data)
+def book_slot(slot_id: str, host_id: str, guest_id: str, notes: str = "") -> Optional[Dict]:
+    """Book a slot atomically (book_slot RPC: mark booked + insert appointment).
 
-def book_slot(slot_id: str, host_id: str, guest_id: str, notes: str = "") -> Optional[str]:
-    """Returns appointment id if success, else None."""
-    if not _mark_slot_booked(slot_id):
-        return None
-    appt = {
-        "slot_id": slot_id,
-        "host_id": host_id,
-        "guest_id": guest_id,
-        "status": "pending",
-        "notes": notes
-    }
-    res = supabase.table("appointments").insert(appt).execute()
-    st.cache_data.clear()
-    return res.data[0]["id"] if res.data else None
-
-def list_my_appointments(user_id: str):
-    return (
+    Returns the new appointment row with its slot under "availability_slots",
+    or None if the slot was already taken.
+    """
+    res = supabase.rpc("book_slot", {"p_slot_id": slot_id, "p_guest_id": guest_id, "p_notes": notes}).execute()
+    appt = res.data or None
+    get_slot_index().remove([slot_id])
+    invalidate(f"slots:{host_id}")
+    if appt:
+        invalidate(f"appointments:{appt['host_id']}", f"appointments:{appt['guest_id']}")
+    return appt
+
+# Appointment with its slot and both participants' names, in one joined query
+APPOINTMENT_FEED_COLUMNS = (
+    "id, slot_id, host_id, guest_id, status, notes, created_at, "
+    "availability_slots!inner(start_ts,end_ts,user_id), "
+    "host:host_id(name,email), guest:guest_id(name,email)"
+)
+
+@keyed_cache("appointments:{user_id}", ttl=300)
+def get_appointment_feed(user_id: str, when: str = "upcoming", page: int = 0, page_size: int = 20) -> Tuple[List[Dict], bool]:
+    """One page of the user's appointments, joined with slot and counterpart.
+
+    when is "upcoming" (soonest first) or "past" (latest first). Each row
+    gets "role" ("Host"/"Guest") and "counterpart" ({name, email}). Returns
+    (rows, has_more); cached per user until one of their bookings changes.
+    """
+    now_iso = datetime.now(timezone.utc).isoformat()
+    q = (
         supabase.table("appointments")
-        .select("id, slot_id, host_id, guest_id, status, notes, created_at, availability_slots(start_ts,end_ts,user_id)")
+        .select(APPOINTMENT_FEED_COLUMNS)
         .or_(f"host_id.eq.{user_id},guest_id.eq.{user_id}")
-        .order("created_at", desc=True)
-        .execute()
-        .data or []
     )
+    if when == "past":
+        q = q.lt("availability_slots.start_ts", now_iso).order("availability_slots(start_ts)", desc=True)
+    else:
+        q = q.gte("availability_slots.start_ts", now_iso).order("availability_slots(start_ts)")
+    start = page * page_size
+    rows = q.order("id").range(start, start + page_size).execute().data or []
 
-def update_appointment_status(appt_id: str, new_status: str, actor_id: str):
-    # Trust RLS to authorize
-    supabase.table("appointments").update({"status": new_status}).eq("id", appt_id).execute()
-    if new_status in ("cancelled",):
-        # free the slot again
-        appt = supabase.table("appointments").select("slot_id").eq("id", appt_id).single().execute().data
-        if appt:
-            supabase.table("availability_slots").update({"is_booked": False}).eq("id", appt["slot_id"]).execute()
-    st.cache_data.clear()
+    for r in rows:
+        is_host = r["host_id"] == user_id
+        r["role"] = "Host" if is_host else "Guest"
+        r["counterpart"] = (r.get("guest") if is_host else r.get("host")) or {}
+    return rows[:page_size], len(rows) > page_size
+
+def update_appointment_status(appt_id: str, new_status: str, actor_id: str) -> Optional[Dict]:
+    """Set an appointment's status; returns the updated row (None if unchanged).
+
+    Cancelling goes through the cancel_appointment RPC, which checks that
+    actor_id is a participant and frees the slot in the same transaction.
+    """
+    if new_status == "cancelled":
+        res = supabase.rpc("cancel_appointment", {"p_appt_id": appt_id, "p_actor_id": actor_id}).execute()
+        appt = res.data or None
+    else:
+        # Trust RLS to authorize
+        res = supabase.table("appointments").update({"status": new_status}).eq("id", appt_id).execute()
+        appt = res.data[0] if res.data else None
+    if not appt:
+        invalidate(f"appointments:{actor_id}")
+        return None
+    freed = appt.get("availability_slots")
+    if freed:
+        get_slot_index().add([freed])
+        invalidate(f"slots:{appt['host_id']}")
+    invalidate(f"appointments:{appt['host_id']}", f"appointments:{appt['guest_id']}")
+    return appt
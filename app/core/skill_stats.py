@@ -0,0 +1,134 @@
+# app/core/skill_stats.py
+
+import math
+import threading
+import pandas as pd
+import streamlit as st
+from app.core.db import supabase, fetch_all
+from app.core.cache import invalidate
+
+# The skills rated in feedback; unrated ones default to a neutral 3.0
+ALL_SKILLS = ["Estimation", "Framework", "Brainstorming", "Chart Interpretation", "Numerical Calculations"]
+
+
+class SkillStatsStore:
+    """Running per-user, per-skill count / sum / sum of squares of accepted ratings.
+
+    Accepting a feedback updates the store in O(#skills); averages never
+    rescan the feedback history. rebuild() reconstructs it from raw rows.
+    Feedback ids already folded in are remembered, so an entry the rebuild
+    has already read is not counted again when its acceptance is recorded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}       # user_id -> skill -> [count, sum, sum_sq]
+        self._feedback = {}    # user_id -> accepted feedback count
+        self._applied = set()  # feedback ids already folded in
+
+    def add(self, feedback_id, user_id: str, skill_scores: dict) -> bool:
+        """Fold one accepted feedback entry into the user's statistics (once per id)."""
+        with self._lock:
+            return self._add(feedback_id, user_id, skill_scores)
+
+    def _add(self, feedback_id, user_id, skill_scores):
+        if feedback_id in self._applied:
+            return False
+        self._applied.add(feedback_id)
+        self._feedback[user_id] = self._feedback.get(user_id, 0) + 1
+        user = self._stats.setdefault(user_id, {})
+        for skill, rating in (skill_scores or {}).items():
+            try:
+                x = float(rating)
+            except (TypeError, ValueError):
+                continue
+            if math.isnan(x):
+                continue
+            acc = user.setdefault(skill, [0, 0.0, 0.0])
+            acc[0] += 1
+            acc[1] += x
+            acc[2] += x * x
+        return True
+
+    def rebuild(self, feedback_rows: list):
+        """Replace the store's contents with stats from accepted feedback rows."""
+        fresh = SkillStatsStore()
+        for fb in feedback_rows:
+            fresh._add(fb["id"], fb["to_user"], fb.get("skill_scores"))
+        with self._lock:
+            self._stats, self._feedback, self._applied = fresh._stats, fresh._feedback, fresh._applied
+
+    def averages(self, user_id: str) -> dict:
+        """Per-skill averages ({} without feedback; unrated standard skills = 3.0)."""
+        with self._lock:
+            if user_id not in self._feedback:
+                return {}
+            avgs = {s: acc[1] / acc[0] for s, acc in self._stats.get(user_id, {}).items()}
+        for s in ALL_SKILLS:
+            avgs.setdefault(s, 3.0)
+        return avgs
+
+    def summary(self, user_id: str) -> dict:
+        """skill -> {count, mean, std} for the user's rated skills."""
+        with self._lock:
+            stats = {s: list(acc) for s, acc in self._stats.get(user_id, {}).items()}
+        out = {}
+        for s, (n, total, total_sq) in stats.items():
+            mean = total / n
+            out[s] = {"count": n, "mean": mean, "std": math.sqrt(max(total_sq / n - mean * mean, 0.0))}
+        return out
+
+    def feedback_count(self, user_id: str) -> int:
+        with self._lock:
+            return self._feedback.get(user_id, 0)
+
+    def averages_frame(self) -> pd.DataFrame:
+        """Users × skills averages, NaN where unrated except the standard skills (3.0)."""
+        with self._lock:
+            users = list(self._feedback)
+            rows = [{s: acc[1] / acc[0] for s, acc in self._stats.get(u, {}).items()} for u in users]
+        frame = pd.DataFrame.from_records(rows, index=pd.Index(users, name="user_id"))
+        for s in ALL_SKILLS:
+            frame[s] = frame[s].fillna(3.0) if s in frame else 3.0
+        return frame
+
+    def feedback_counts(self) -> pd.Series:
+        """Accepted feedback count per user, indexed by user id."""
+        with self._lock:
+            counts = pd.Series(self._feedback, dtype=int)
+        counts.index.name = "user_id"
+        return counts
+
+
+def fetch_accepted_feedback():
+    """Fetch the skill scores of every accepted feedback entry in one pass."""
+    return fetch_all(
+        lambda: supabase.table("feedback")
+        .select("id, to_user, skill_scores")
+        .eq("status", "accepted")
+        .order("id")
+    )
+
+
+@st.cache_resource(ttl=600)
+def get_skill_stats() -> SkillStatsStore:
+    """Process-wide store; rebuilt from raw feedback when the TTL expires."""
+    store = SkillStatsStore()
+    store.rebuild(fetch_accepted_feedback())
+    return store
+
+
+def rebuild_skill_stats():
+    """Reconstruct the running statistics from the raw accepted feedback."""
+    get_skill_stats().rebuild(fetch_accepted_feedback())
+    invalidate("feedback")
+
+
+def record_accepted_feedback(feedback_id, to_user: str, skill_scores: dict):
+    """Apply one newly accepted feedback to the store (O(1) in history length).
+
+    A no-op for an entry the store already holds, e.g. when a cold store was
+    just rebuilt from rows that include this acceptance.
+    """
+    get_skill_stats().add(feedback_id, to_user, skill_scores)
+    invalidate("feedback", f"feedback:{to_user}")
@@ -0,0 +1,49 @@
+# app/core/slot_display.py
+
+from functools import lru_cache as _memoize
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+import pandas as pd
+from app.core.cache import lru_cache
+
+DEFAULT_TZ = "Europe/Paris"
+
+# Formatted label lists kept per (slot snapshot, timezone)
+LABEL_CACHE_MAX_ENTRIES = 256
+
+START_FMT = "%a %d %b %H:%M"
+END_FMT = "%H:%M"
+
+
+@_memoize(maxsize=None)
+def get_zone(tz_str: Optional[str]) -> ZoneInfo:
+    """ZoneInfo for an IANA name (built once per name)."""
+    return ZoneInfo(tz_str or DEFAULT_TZ)
+
+
+def to_local(values, tz_str: Optional[str]) -> pd.DatetimeIndex:
+    """Parse ISO strings / datetimes as UTC and convert them in one vectorized pass."""
+    idx = pd.DatetimeIndex(pd.to_datetime(pd.Series(list(values), dtype=object), utc=True, format="ISO8601"))
+    return idx.tz_convert(get_zone(tz_str))
+
+
+def slot_labels(slots: list, tz_str: Optional[str], start_key: str = "start_ts", end_key: Optional[str] = "end_ts") -> List[str]:
+    """Labels like "Mon 03 Mar 19:00 → 20:30" for a batch of slots, in the viewer's timezone.
+
+    Cached per (slot snapshot, timezone): the same list rendered again on the
+    next rerun is neither re-parsed nor re-formatted. With end_key=None only
+    the start is shown.
+    """
+    if not slots:
+        return []
+    snapshot = tuple((s[start_key], s[end_key] if end_key else None) for s in slots)
+    key = (snapshot, tz_str or DEFAULT_TZ)
+
+    def compute():
+        starts = to_local((s for s, _ in snapshot), tz_str).strftime(START_FMT)
+        if not end_key:
+            return list(starts)
+        ends = to_local((e for _, e in snapshot), tz_str).strftime(END_FMT)
+        return [f"{s} → {e}" for s, e in zip(starts, ends)]
+
+    return lru_cache("slot_labels", LABEL_CACHE_MAX_ENTRIES).get_or_compute(key, compute)
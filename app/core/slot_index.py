@@ -0,0 +1,172 @@
+# app/core/slot_index.py
+
+import threading
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import streamlit as st
+from app.core.db import supabase, fetch_all
+
+
+def _ns(ts) -> int:
+    """UTC epoch nanoseconds of an ISO string, datetime or Timestamp."""
+    t = pd.Timestamp(ts)
+    if t.tzinfo is None:
+        t = t.tz_localize("UTC")
+    return int(t.value)
+
+
+def _ns_array(values) -> np.ndarray:
+    return pd.to_datetime(pd.Series(values, dtype=object), utc=True, format="ISO8601").to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+
+class SlotIndex:
+    """Time-sorted interval index over the open future slots of all hosts.
+
+    Slots are kept sorted by start; with the longest slot duration as bound,
+    an overlap query is two binary searches plus the matches, i.e.
+    O(log n + k). Writes made by this process update it in place (add /
+    remove), so it does not need a refetch after every booking.
+    """
+
+    def __init__(self, slots: list):
+        self._lock = threading.Lock()
+        self._set(sorted(slots, key=lambda s: _ns(s["start_ts"])))
+
+    def _set(self, slots):
+        self._slots = slots
+        self._starts = _ns_array([s["start_ts"] for s in slots]) if slots else np.empty(0, dtype=np.int64)
+        self._ends = _ns_array([s["end_ts"] for s in slots]) if slots else np.empty(0, dtype=np.int64)
+        self._hosts = np.array([s["user_id"] for s in slots], dtype=object)
+        self._max_len = int((self._ends - self._starts).max()) if slots else 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    # --- incremental maintenance --- #
+
+    def add(self, slots: list):
+        """Insert newly opened slots at their sorted positions."""
+        slots = sorted((s for s in slots or [] if s.get("end_ts")), key=lambda s: _ns(s["start_ts"]))
+        if not slots:
+            return
+        self.remove([s["id"] for s in slots])
+        starts = _ns_array([s["start_ts"] for s in slots])
+        ends = _ns_array([s["end_ts"] for s in slots])
+        with self._lock:
+            pos = np.searchsorted(self._starts, starts, side="right")
+            # positions refer to the old list, so insert from the back
+            for p, s in zip(pos[::-1], slots[::-1]):
+                self._slots.insert(int(p), s)
+            self._starts = np.insert(self._starts, pos, starts)
+            self._ends = np.insert(self._ends, pos, ends)
+            self._hosts = np.insert(self._hosts, pos, np.array([s["user_id"] for s in slots], dtype=object))
+            self._max_len = max(self._max_len, int((ends - starts).max()))
+
+    def remove(self, slot_ids):
+        """Drop slots that were booked or deleted."""
+        slot_ids = set(slot_ids)
+        with self._lock:
+            keep = [i for i, s in enumerate(self._slots) if s["id"] not in slot_ids]
+            if len(keep) == len(self._slots):
+                return
+            self._slots = [self._slots[i] for i in keep]
+            self._starts, self._ends, self._hosts = self._starts[keep], self._ends[keep], self._hosts[keep]
+
+    # --- queries --- #
+
+    def overlapping(self, window_start, window_end, host_ids=None) -> list:
+        """Open slots overlapping [window_start, window_end), optionally of some hosts."""
+        lo_ns, hi_ns = _ns(window_start), _ns(window_end)
+        with self._lock:
+            lo = np.searchsorted(self._starts, lo_ns - self._max_len, side="right")
+            hi = np.searchsorted(self._starts, hi_ns, side="left")
+            idx = lo + np.flatnonzero(self._ends[lo:hi] > lo_ns)
+            if host_ids is not None:
+                idx = idx[np.isin(self._hosts[idx], list(host_ids))]
+            return [self._slots[i] for i in idx]
+
+    def hosts_free_between(self, window_start, window_end) -> set:
+        """Hosts with an open slot overlapping the window."""
+        return {s["user_id"] for s in self.overlapping(window_start, window_end)}
+
+    def next_open(self, host_ids, n: int = 5, now=None) -> list:
+        """The next n open slots (from now) across the given hosts, soonest first."""
+        hosts = list(host_ids)
+        with self._lock:
+            pos = np.searchsorted(self._starts, _ns(now or datetime.now(timezone.utc)), side="left")
+            found, chunk = [], max(64, 4 * n)
+            while pos < len(self._slots) and len(found) < n:
+                idx = pos + np.flatnonzero(np.isin(self._hosts[pos:pos + chunk], hosts))
+                found.extend(idx[: n - len(found)])
+                pos += chunk
+            return [self._slots[i] for i in found]
+
+    def for_host(self, host_id: str, now=None) -> list:
+        """All open future slots of one host, soonest first."""
+        with self._lock:
+            pos = np.searchsorted(self._starts, _ns(now or datetime.now(timezone.utc)), side="left")
+            idx = pos + np.flatnonzero(self._hosts[pos:] == host_id)
+            return [self._slots[i] for i in idx]
+
+
+    def mutual_windows(self, user_id: str, partner_ids, now=None) -> dict:
+        """Common open windows between a user's slots and each partner's slots.
+
+        One vectorized interval intersection over the sorted start arrays:
+        every partner slot is matched against the user's slots starting in
+        (partner_start - longest slot, partner_end). Returns partner id ->
+        list of {"start", "end", "slot"} (UTC timestamps, the partner's slot),
+        soonest first; partners without a common window are omitted.
+        """
+        partners = list(partner_ids)
+        with self._lock:
+            pos = np.searchsorted(self._starts, _ns(now or datetime.now(timezone.utc)), side="left")
+            hosts = self._hosts[pos:]
+            mine = pos + np.flatnonzero(hosts == user_id)
+            theirs = pos + np.flatnonzero(np.isin(hosts, partners))
+            if not len(mine) or not len(theirs):
+                return {}
+
+            my_starts, my_ends = self._starts[mine], self._ends[mine]
+            p_starts, p_ends = self._starts[theirs], self._ends[theirs]
+
+            lo = np.searchsorted(my_starts, p_starts - self._max_len, side="right")
+            hi = np.searchsorted(my_starts, p_ends, side="left")
+            counts = np.maximum(hi - lo, 0)
+            j = np.repeat(np.arange(len(theirs)), counts)
+            i = np.repeat(lo, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+
+            starts = np.maximum(my_starts[i], p_starts[j])
+            ends = np.minimum(my_ends[i], p_ends[j])
+            ok = ends > starts
+            j, starts, ends = j[ok], starts[ok], ends[ok]
+
+            windows = {}
+            for jj, s, e in zip(j, starts, ends):
+                slot = self._slots[theirs[jj]]
+                windows.setdefault(slot["user_id"], []).append({
+                    "start": pd.Timestamp(int(s), tz="UTC"),
+                    "end": pd.Timestamp(int(e), tz="UTC"),
+                    "slot": slot,
+                })
+            return windows
+
+
+def fetch_open_slots(now_utc=None):
+    """All open (unbooked) future slots of every host."""
+    now_utc = now_utc or datetime.now(timezone.utc)
+    return fetch_all(
+        lambda: supabase.table("availability_slots")
+        .select("*")
+        .eq("is_booked", False)
+        .gte("start_ts", now_utc.isoformat())
+        .order("start_ts", desc=False)
+        .order("id")
+    )
+
+
+@st.cache_resource(ttl=300)
+def get_slot_index() -> SlotIndex:
+    """Process-wide slot index, rebuilt from the backend when the TTL expires."""
+    return SlotIndex(fetch_open_slots())
@@ -0,0 +1,71 @@
+# app/core/snapshot.py
+
+import sys
+import weakref
+import numpy as np
+import pandas as pd
+
+
+def _column(values: list) -> np.ndarray:
+    """Typed array for numeric/bool columns, object array (one pointer per row) otherwise."""
+    if values and all(isinstance(v, (bool, int, float)) for v in values):
+        return np.asarray(values)
+    arr = np.empty(len(values), dtype=object)
+    # element-wise, so list values (e.g. firms_applying) stay one cell each
+    for i, v in enumerate(values):
+        arr[i] = v
+    return arr
+
+
+# name -> the live snapshot of that table, for diagnostics (never triggers a load)
+_built = weakref.WeakValueDictionary()
+
+
+def built_snapshots() -> dict:
+    """Snapshots that are currently built, by table name."""
+    return dict(_built)
+
+
+def _value(v):
+    # numpy scalars from typed columns back to plain Python values
+    return v.item() if isinstance(v, np.generic) else v
+
+
+class TableSnapshot:
+    """Immutable columnar snapshot of a table, shared by every session.
+
+    Holds one read-only array per column plus an id lookup. Filters and
+    exclusions are boolean masks or position arrays computed per call over
+    these arrays, so no session keeps its own copy of the table; only the
+    rows actually shown are materialized as dicts (whose nested values are
+    shared and must not be mutated).
+    """
+
+    def __init__(self, rows: list, columns, name: str | None = None):
+        self.columns = tuple(columns)
+        self._data = {c: _column([r.get(c) for r in rows]) for c in self.columns}
+        for arr in self._data.values():
+            arr.setflags(write=False)
+        self._index = pd.Index(self._data["id"]) if "id" in self._data else pd.RangeIndex(len(rows))
+        self.nbytes = sum(
+            arr.nbytes + (sum(sys.getsizeof(v) for v in arr) if arr.dtype == object else 0)
+            for arr in self._data.values()
+        )
+        if name:
+            _built[name] = self
+
+    def __len__(self):
+        return len(self._index)
+
+    def column(self, name: str) -> np.ndarray:
+        """The read-only array of one column (no copy)."""
+        return self._data[name]
+
+    def positions(self, ids) -> np.ndarray:
+        """Row positions of the given ids (-1 where absent)."""
+        return self._index.get_indexer(list(ids))
+
+    def rows(self, positions=None) -> list:
+        """Materialize the rows at the given positions (all rows by default)."""
+        positions = range(len(self)) if positions is None else positions
+        return [{c: _value(self._data[c][p]) for c in self.columns} for p in positions]
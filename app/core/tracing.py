@@ -0,0 +1,162 @@
+# app/core/tracing.py
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+import streamlit as st
+
+# Set HCC_QUERY_TRACE=1 to show the sidebar debug panel
+SHOW_TRACE_PANEL = os.environ.get("HCC_QUERY_TRACE") == "1"
+
+# Set to a file path to append every traced call as one JSON line
+QUERY_LOG_PATH = os.environ.get("HCC_QUERY_LOG")
+
+# Without the panel or the log nothing reads the trace, so clients are not wrapped
+TRACING_ENABLED = SHOW_TRACE_PANEL or bool(QUERY_LOG_PATH)
+
+# Same-shape queries repeated this often within one rerun are flagged as N+1
+N_PLUS_ONE_THRESHOLD = 3
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIP_FILES = {os.path.abspath(__file__), os.path.join(_APP_DIR, "core", "cache.py")}
+
+
+def begin_trace():
+    """Start a new script run: reset the per-rerun query trace."""
+    st.session_state["_query_trace"] = []
+
+
+def get_trace() -> list:
+    """Records of the backend calls made so far in the current run."""
+    return st.session_state.get("_query_trace", [])
+
+
+def _caller():
+    """Name of the innermost app function that issued the query."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = os.path.abspath(frame.f_code.co_filename)
+        if path.startswith(_APP_DIR) and path not in _SKIP_FILES:
+            module = frame.f_globals.get("__name__", "?")
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+def _record(table, op, filters, data, started):
+    latency_ms = (time.perf_counter() - started) * 1000
+    rows = len(data) if isinstance(data, list) else int(data is not None)
+    # Columns but not values, so the same query for different users has one shape
+    shape = [f"{method}({column})" if column else method for method, column in filters]
+    entry = {
+        "ts": time.time(),
+        "tab": st.session_state.get("active_view"),
+        "caller": _caller(),
+        "table": table,
+        "op": op,
+        "filters": shape,
+        "shape": f"{table}.{op}:" + ",".join(shape),
+        "rows": rows,
+        "bytes": len(json.dumps(data, default=str)) if data is not None else 0,
+        "latency_ms": round(latency_ms, 2),
+    }
+    st.session_state.setdefault("_query_trace", []).append(entry)
+    if QUERY_LOG_PATH:
+        with open(QUERY_LOG_PATH, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry) + "\n")
+
+
+class _TracedQuery:
+    """Wraps a postgrest request builder and records its execute() call."""
+
+    _OPS = {"select", "insert", "update", "upsert", "delete"}
+
+    def __init__(self, builder, table, op="select"):
+        self._builder = builder
+        self._table = table
+        self._op = op
+        self._filters = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if name == "not_":
+            # a property returning the negated builder
+            self._builder = attr
+            return self
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            if name in self._OPS:
+                self._op = name
+            else:
+                column = args[0] if args and isinstance(args[0], str) and name != "or_" else None
+                self._filters.append((name, column))
+            self._builder = attr(*args, **kwargs)
+            return self
+
+        return call
+
+    def execute(self):
+        started = time.perf_counter()
+        res = self._builder.execute()
+        _record(self._table, self._op, self._filters, getattr(res, "data", None), started)
+        return res
+
+
+class TracedClient:
+    """Supabase client proxy that records every table/RPC round trip."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, name):
+        return _TracedQuery(self._client.table(name), name)
+
+    def rpc(self, fn, params=None, *args, **kwargs):
+        return _TracedQuery(self._client.rpc(fn, params or {}, *args, **kwargs), f"rpc:{fn}", op="rpc")
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def trace_client(client):
+    """Wrap a Supabase client so its queries show up in the query trace.
+
+    Returns the client unchanged unless the panel or the log is enabled, so
+    normal runs pay no stack walk or payload serialization per query.
+    """
+    return TracedClient(client) if TRACING_ENABLED else client
+
+
+def n_plus_one(trace=None) -> list:
+    """Query shapes repeated at least N_PLUS_ONE_THRESHOLD times in one run."""
+    trace = get_trace() if trace is None else trace
+    counts = Counter(t["shape"] for t in trace)
+    return [
+        {"shape": shape, "count": n, "callers": sorted({t["caller"] for t in trace if t["shape"] == shape})}
+        for shape, n in counts.most_common()
+        if n >= N_PLUS_ONE_THRESHOLD
+    ]
+
+
+def render_trace_panel(container):
+    """Sidebar debug panel summarizing the backend calls of this run."""
+    trace = get_trace()
+    with container.expander(f"🐞 Backend queries ({len(trace)})", expanded=False):
+        if not trace:
+            st.caption("No backend calls in this run.")
+            return
+        st.caption(
+            f"{sum(t['latency_ms'] for t in trace):.0f} ms · "
+            f"{sum(t['bytes'] for t in trace) / 1024:.1f} KiB · "
+            f"{sum(t['rows'] for t in trace)} rows"
+        )
+        for issue in n_plus_one(trace):
+            st.warning(f"Possible N+1: {issue['shape']} ×{issue['count']} from {', '.join(issue['callers'])}")
+        st.dataframe(
+            [{k: t[k] for k in ("caller", "table", "op", "filters", "rows", "bytes", "latency_ms")} for t in trace],
+            use_container_width=True,
+        )
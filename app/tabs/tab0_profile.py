@@ -1,9 +1,31 @@
 import streamlit as st
 from app.core.db import get_user_profile, update_my_profile
+from app.core.slot_display import slot_labels
 
 from datetime import datetime, timedelta, date, time
-from zoneinfo import ZoneInfo
-from app.core.scheduling import get_slots_for_user, add_slots, delete_slot, list_my_appointments, update_appointment_status, SLOT_MINUTES
+from app.core.scheduling import (
+    get_slots_for_user, add_slots, add_recurring_slots, summarize_outcomes, delete_slot, delete_slots,
+    get_appointment_feed, update_appointment_status, SLOT_MINUTES,
+)
+
+APPOINTMENTS_PAGE_SIZE = 10
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def _report_outcomes(outcomes):
+    """Show how many requested slots were created and why others were skipped."""
+    summary = summarize_outcomes(outcomes)
+    skipped = [f"{n} {why}" for why, n in summary.items() if why != "created" and n]
+    st.session_state["tab0_slot_report"] = (
+        f"Added {summary['created']} slot(s)." + (f" Skipped: {', '.join(skipped)}." if skipped else "")
+    )
+
+
+def _report_appointment(appt):
+    """Remember the outcome of a confirm/cancel click for the next rerun."""
+    st.session_state["tab0_appt_report"] = (
+        f"Appointment {appt['status']}." if appt else "That appointment could not be updated; it may have changed meanwhile."
+    )
 
 
 def render(user):
@@ -82,55 +104,92 @@ def render(user):
             days = col1.multiselect(
                 "Pick dates (next 14 days)",
                 [date.today() + timedelta(days=i) for i in range(0, 14)],
-                []
+                key="tab0_slot_days",
             )
             start_times = col2.multiselect(
                 "Pick start times",
                 [time(h, m) for h in range(7, 22) for m in (0,30)],
-                []
+                key="tab0_slot_times",
             )
             if st.button("➕ Add 90-min slots"):
                 starts_local = [datetime.combine(d, t) for d in days for t in start_times]
                 if starts_local:
-                    add_slots(user.id, starts_local, tz_str)
-                    st.success(f"Added {len(starts_local)} slot(s).")
+                    _report_outcomes(add_slots(user.id, starts_local, tz_str))
                     st.rerun()
                 else:
                     st.info("Select at least one date and time.")
 
+            # 1b) Weekly recurring pattern
+            st.write("#### Repeat weekly")
+            r1, r2, r3 = st.columns(3)
+            weekdays = r1.multiselect("Weekdays", list(range(7)), format_func=lambda i: WEEKDAYS[i], key="tab0_rec_weekdays")
+            rec_time = r2.selectbox("Start time", [time(h, m) for h in range(7, 22) for m in (0,30)], index=24, key="tab0_rec_time")
+            weeks = r3.number_input("Weeks", min_value=1, max_value=12, value=4, key="tab0_rec_weeks")
+            if st.button("🔁 Add recurring slots"):
+                if weekdays:
+                    _report_outcomes(add_recurring_slots(user.id, weekdays, rec_time, int(weeks), tz_str))
+                    st.rerun()
+                else:
+                    st.info("Select at least one weekday.")
+
+            report = st.session_state.pop("tab0_slot_report", None)
+            if report:
+                st.success(report)
+
             # 2) List & delete my slots
             st.write("### Open Slots")
             slots = get_slots_for_user(user.id, include_booked=False)
             if not slots:
                 st.caption("No open slots.")
             else:
+                labels = dict(zip((s["id"] for s in slots), slot_labels(slots, tz_str)))
                 for s in slots:
-                    start_local = datetime.fromisoformat(s["start_ts"].replace("Z","+00:00")).astimezone(ZoneInfo(tz_str))
-                    end_local   = datetime.fromisoformat(s["end_ts"].replace("Z","+00:00")).astimezone(ZoneInfo(tz_str))
                     cols = st.columns([3,1])
-                    cols[0].markdown(f"**{start_local:%a %d %b %H:%M} → {end_local:%H:%M}**")
+                    cols[0].markdown(f"**{labels[s['id']]}**")
                     if cols[1].button("🗑️ Delete", key=f"del_{s['id']}"):
                         delete_slot(s["id"], user.id)
                         st.rerun()
 
+                selected = st.multiselect("Select slots to delete", list(labels), format_func=labels.get, key="tab0_del_slots")
+                if st.button("🗑️ Delete selected", disabled=not selected):
+                    n = delete_slots(selected, user.id)
+                    st.session_state["tab0_slot_report"] = f"Deleted {n} slot(s)."
+                    st.session_state.pop("tab0_del_slots", None)
+                    st.rerun()
+
         with st.expander("📔 My Appointments", expanded=False):
             tz_str = (get_user_profile(user.id) or {}).get("timezone") or "Europe/Paris"
-            appts = list_my_appointments(user.id)
+            report = st.session_state.pop("tab0_appt_report", None)
+            if report:
+                st.info(report)
+            when = st.radio("Show", ["Upcoming", "Past"], horizontal=True, key="tab0_appt_when")
+            if st.session_state.get("tab0_appt_page_when") != when:
+                st.session_state["tab0_appt_page_when"] = when
+                st.session_state["tab0_appt_page"] = 0
+            page = st.session_state["tab0_appt_page"]
+            appts, has_more = get_appointment_feed(user.id, when.lower(), page, APPOINTMENTS_PAGE_SIZE)
             if not appts:
-                st.caption("No appointments yet.")
+                st.caption(f"No {when.lower()} appointments." if page == 0 else "No more appointments.")
             else:
-                for a in appts:
-                    slot = a["availability_slots"]
-                    start_local = datetime.fromisoformat(slot["start_ts"].replace("Z","+00:00")).astimezone(ZoneInfo(tz_str))
-                    end_local   = datetime.fromisoformat(slot["end_ts"].replace("Z","+00:00")).astimezone(ZoneInfo(tz_str))
-                    who = "Host" if a["host_id"] == user.id else "Guest"
-                    st.markdown(f"**{start_local:%a %d %b %H:%M} → {end_local:%H:%M}** · _{who}_ · **{a['status']}**")
+                labels = slot_labels([a["availability_slots"] for a in appts], tz_str)
+                for a, label in zip(appts, labels):
+                    other = a["counterpart"].get("name") or (a["counterpart"].get("email") or "—").split("@")[0]
+                    st.markdown(f"**{label}** · _{a['role']}_ with **{other}** · **{a['status']}**")
                     c1, c2, c3 = st.columns(3)
                     if a["host_id"] == user.id and a["status"] == "pending":
                         if c1.button("✅ Confirm", key=f"c_{a['id']}"):
-                            update_appointment_status(a["id"], "confirmed", user.id); st.rerun()
+                            _report_appointment(update_appointment_status(a["id"], "confirmed", user.id)); st.rerun()
                     if a["status"] in ("pending","confirmed"):
                         if c2.button("❌ Cancel", key=f"x_{a['id']}"):
-                            update_appointment_status(a["id"], "cancelled", user.id); st.rerun()
+                            _report_appointment(update_appointment_status(a["id"], "cancelled", user.id)); st.rerun()
                     if a.get("notes"):
-                        c3.write(a["notes"])
\ No newline at end of file
+                        c3.write(a["notes"])
+
+            if page > 0 or has_more:
+                nav_prev, _, nav_next = st.columns([1, 4, 1])
+                if nav_prev.button("← Previous", disabled=page == 0, key="appts_prev"):
+                    st.session_state["tab0_appt_page"] = page - 1
+                    st.rerun()
+                if nav_next.button("Next →", disabled=not has_more, key="appts_next"):
+                    st.session_state["tab0_appt_page"] = page + 1
+                    st.rerun()
@@ -1,11 +1,11 @@
 import streamlit as st
 import pandas as pd
-from app.core.db import supabase
+from app.core.db import get_case_titles
 from app.core.charts import radar_chart, performance_line_chart
 from app.core.analytics_utils import (
     get_user_feedback,
     feedback_to_dataframe,
-    compute_skill_averages
+    get_user_skill_avgs
 )
 
 def render(user):
@@ -20,14 +20,15 @@ def render(user):
     # --- Prepare data ---
     df = feedback_to_dataframe(feedback_data)
 
-    case_map = {c["id"]: c["title"] for c in supabase.table("cases").select("id, title").execute().data}
+    case_map = {c["id"]: c["title"] for c in get_case_titles()}
     df["Case"] = df["case_id"].map(case_map)
     df.drop(columns=["case_id"], inplace=True)
     cols = ["Date", "Case"] + [c for c in df.columns if c not in ["Date", "Case"]]
     df = df[cols]
 
-    # --- Compute averages ---
-    skill_avgs, skill_cols = compute_skill_averages(df) 
+    # --- Averages (running per-skill stats) ---
+    skill_avgs = get_user_skill_avgs(user.id)
+    skill_cols = [c for c in df.columns if c not in ["Date", "Case"]]
 
     st.write("### 📈 Summary Stats")
     col1, col2, col3 = st.columns(3)
@@ -45,6 +46,7 @@ def render(user):
             "View Progress Over:",
             ["Number of Cases Practiced", "Time (by Date)"],
             horizontal=True,
+            key="tab1_progress_mode",
         )
         st.plotly_chart(
             performance_line_chart(df, skill_cols, mode),
@@ -53,4 +55,8 @@ def render(user):
 
     # --- Table ---
     with st.expander("📋 View Detailed Feedback Data"):
-        st.dataframe(df, use_container_width=True)
+        st.dataframe(
+            df,
+            use_container_width=True,
+            column_config={"Date": st.column_config.DateColumn("Date")},
+        )
@@ -2,8 +2,12 @@ import streamlit as st
 import pandas as pd
 from app.core.analytics_utils import get_user_skill_avgs
 from app.core.recommendations_cases import (
+    CASE_FACETS,
     recommend_cases,
-    get_all_cases
+    get_case_facet_index,
+    get_case_details,
+    match_cases,
+    facet_counts
 )
 
 def render(user):
@@ -14,6 +18,7 @@ def render(user):
         "Choose Mode:",
         ["🧭 Explore Cases", "🤖 Personalized Recommendations"],
         horizontal=True,
+        key="tab2_mode",
     )
 
     # -------------------------------------------------------------------------
@@ -22,46 +27,46 @@ def render(user):
     if mode == "🧭 Explore Cases":
         st.subheader("🔍 Explore Cases by Filters")
 
-        cases = get_all_cases()
-        if not cases:
+        index = get_case_facet_index()
+        table = index[0]
+        if table.empty:
             st.warning("No cases found in the database.")
             return
 
-        df = pd.DataFrame(cases)
-
-        # --- Filters ---
-        c1, c2, c3, c4 = st.columns(4)
-
-        difficulties = ["All"] + sorted(df["difficulty"].dropna().unique().tolist())
-        industries = ["All"] + sorted(df["industry"].dropna().unique().tolist())
-        focuses = ["All"] + sorted(df["focus_area"].dropna().unique().tolist())
-        styles = ["All"] + sorted(df["case_style"].dropna().unique().tolist()) if "case_style" in df else ["All"]
-
-        difficulty = c1.selectbox("Difficulty", difficulties)
-        industry = c2.selectbox("Industry", industries)
-        focus = c3.selectbox("Focus Area", focuses)
-        style = c4.selectbox("Case Style", styles)
+        # --- Filters (with live counts for the other filters' selection) ---
+        selections = {f: st.session_state.get(f"tab2_{f}", "All") for f in CASE_FACETS}
+        for col, (facet, label) in zip(st.columns(len(CASE_FACETS)), CASE_FACETS.items()):
+            counts = facet_counts(index, selections, facet)
+            selections[facet] = col.selectbox(
+                label,
+                ["All"] + list(index[1][facet]),
+                format_func=lambda v, counts=counts: v if v == "All" else f"{v} ({counts.get(v, 0)})",
+                key=f"tab2_{facet}",
+            )
 
         # --- Apply filters ---
-        if difficulty != "All":
-            df = df[df["difficulty"] == difficulty]
-        if industry != "All":
-            df = df[df["industry"] == industry]
-        if focus != "All":
-            df = df[df["focus_area"] == focus]
-        if style != "All":
-            df = df[df["case_style"] == style]
-
+        df = table[match_cases(index, selections)]
 
         if df.empty:
             st.info("No cases match your filters.")
         else:
             st.write(f"Showing **{len(df)}** matching cases:")
             st.dataframe(
-                df[["title", "difficulty", "industry", "focus_area", "description"]],
+                df[["title", "difficulty", "industry", "focus_area"]],
                 use_container_width=True
             )
 
+            # Descriptions are fetched only for the case being looked at
+            picked = st.selectbox(
+                "Case details",
+                [None] + list(df.index),
+                format_func=lambda i: "👉 Choose a case to read its description" if i is None else df.at[i, "title"],
+                key="tab2_detail",
+            )
+            if picked is not None:
+                case_id = df.at[picked, "id"]
+                st.info(get_case_details((case_id,)).get(case_id, {}).get("description") or "No description yet.")
+
     # -------------------------------------------------------------------------
     # 2️⃣  PERSONALIZED RECOMMENDATIONS
     # -------------------------------------------------------------------------
@@ -83,6 +88,7 @@ def render(user):
             "Select Recommendation Type:",
             ["Fix Weaknesses", "Build on Strengths"],
             horizontal=True,
+            key="tab2_rec_mode",
         )
         rec_mode_key = "fix_weaknesses" if rec_mode == "Fix Weaknesses" else "build_strengths"
 
@@ -90,6 +96,7 @@ def render(user):
             "Preferred Case Style",
             ["Any", "Candidate-led", "Interviewer-led"],
             horizontal=True,
+            key="tab2_pref_style",
         )
 
         # --- Get recommendations ---
@@ -102,11 +109,14 @@ def render(user):
 
         st.write(f"### 🏆 Top {len(recs)} Recommended Cases — *{rec_mode}*")
 
+        # One projected fetch for the descriptions of the shown cases only
+        details = get_case_details(tuple(c["id"] for c in recs))
+
         for i, case in enumerate(recs, 1):
             with st.expander(f"{i}. {case['title']} — ({case['difficulty']})"):
                 st.markdown(f"**Industry:** {case.get('industry', '—')}")
                 st.markdown(f"**Focus Area:** {case.get('focus_area', '—')}")
-                st.markdown(f"**Description:** {case.get('description', '')}")
+                st.markdown(f"**Description:** {details.get(case['id'], {}).get('description', '')}")
 
                 # Visualize how relevant each skill is to this case
                 skills = case.get("skill_weights", {})
@@ -1,12 +1,14 @@
 # app/tabs/tab3_partner_recommendations.py
 
 import streamlit as st
-import pandas as pd
-from app.core.recommendations_partners import recommend_partners, get_all_users
-from app.core.scheduling import get_bookable_slots_for_host, book_slot
+from app.core.recommendations_partners import (
+    recommend_partners, get_users_page, get_user_snapshot, match_users, apply_availability_bonus
+)
+from app.core.scheduling import get_bookable_slots_for_host, next_open_slots, mutual_availability, book_slot
 from app.core.db import get_user_profile
-from zoneinfo import ZoneInfo
-from datetime import datetime
+from app.core.slot_display import slot_labels
+
+USERS_PAGE_SIZE = 10
 
 def render(user):
     st.header("👥 Partner Recommendation System")
@@ -15,6 +17,7 @@ def render(user):
         "Choose Mode:",
         ["🧭 Explore Users", "🤖 Personalized Recommendations"],
         horizontal=True,
+        key="tab3_mode",
     )
 
     if "book_host" not in st.session_state:
@@ -34,47 +37,51 @@ def render(user):
     if mode == "🧭 Explore Users":
         st.subheader("🔍 Explore Users")
 
-        users = get_all_users(exclude_user_id=user.id)
-        if not users:
-            st.info("No other users found.")
-            return
-
-        df = pd.DataFrame(users)
-
-        # Ensure expected columns exist
-        for col in ["experience_level","firms_applying","availability","timezone","linkedin_url","bio"]:
-            if col not in df.columns:
-                df[col] = None
+        snapshot = get_user_snapshot()
+        languages, firms_universe = snapshot["languages"], snapshot["firms"]
 
         # --- Filters row (3 columns) ---
         c1, c2, c3 = st.columns(3)
-        languages = ["All"] + sorted(df["language"].dropna().unique().tolist())
-        lang = c1.selectbox("Language", languages)
+        lang = c1.selectbox("Language", ["All"] + languages, key="tab3_language")
 
         levels = ["All","Beginner","Intermediate","Advanced"]
-        lvl = c2.selectbox("Experience", levels)
-
-        firms_universe = sorted({f for arr in (df["firms_applying"].dropna() if "firms_applying" in df else []) for f in (arr or [])})
-        firms_filter = c3.multiselect("Firms (must include all selected)", firms_universe)
-
-        # --- Apply filters ---
-        if lang != "All":
-            df = df[df["language"] == lang]
-        if lvl != "All":
-            df = df[df["experience_level"] == lvl]
-        if firms_filter:
-            def has_all_firms(arr):
-                s = set(arr or [])
-                return set(firms_filter).issubset(s)
-            df = df[df["firms_applying"].apply(has_all_firms)]
+        lvl = c2.selectbox("Experience", levels, key="tab3_level")
+
+        firms_filter = c3.multiselect("Firms (must include all selected)", firms_universe, key="tab3_firms")
+
+        # --- Page through matches (sliced from the shared users snapshot) ---
+        filters = (lang, lvl, tuple(firms_filter))
+        if st.session_state.get("tab3_page_filters") != filters:
+            st.session_state["tab3_page_filters"] = filters
+            st.session_state["tab3_page_cursors"] = [None]
+        cursors = st.session_state["tab3_page_cursors"]
+
+        filter_args = dict(
+            exclude_user_id=user.id,
+            language=None if lang == "All" else lang,
+            experience_level=None if lvl == "All" else lvl,
+            firms=tuple(firms_filter),
+        )
+        total = int(match_users(snapshot, **filter_args).sum())
+        rows, next_cursor = get_users_page(**filter_args, before=cursors[-1], page_size=USERS_PAGE_SIZE)
 
         # --- Results ---
-        if df.empty:
+        if not rows:
             st.info("No users match your filters.")
         else:
-            st.write(f"Showing **{len(df)}** matching users:")
+            first = (len(cursors) - 1) * USERS_PAGE_SIZE + 1
+            st.write(f"Showing **{first}–{first + len(rows) - 1}** of **{total}** matching users:")
+
+            nav_prev, _, nav_next = st.columns([1, 4, 1])
+            if nav_prev.button("← Previous", disabled=len(cursors) == 1, key="users_prev"):
+                cursors.pop()
+                st.rerun()
+            if nav_next.button("Next →", disabled=next_cursor is None, key="users_next"):
+                cursors.append(next_cursor)
+                st.rerun()
+
             # Profile cards
-            for _, row in df.sort_values("created_at", ascending=False).iterrows():
+            for row in rows:
                 st.markdown("---")
                 cA, cB = st.columns([3,1])
                 with cA:
@@ -109,19 +116,17 @@ def render(user):
                         slots = get_bookable_slots_for_host(host_id)
 
                         # show in my timezone
-                        tz_me = (get_user_profile(user.id) or {}).get("timezone") or "Europe/Paris"
+                        tz_me = (get_user_profile(user.id, "timezone") or {}).get("timezone") or "Europe/Paris"
 
                         if not slots:
                             st.caption("No open slots.")
                         else:
-                            for s in slots:
-                                start_local = datetime.fromisoformat(s["start_ts"].replace("Z","+00:00")).astimezone(ZoneInfo(tz_me))
-                                end_local   = datetime.fromisoformat(s["end_ts"].replace("Z","+00:00")).astimezone(ZoneInfo(tz_me))
+                            for s, label in zip(slots, slot_labels(slots, tz_me)):
                                 cc = st.columns([3,2])
-                                cc[0].markdown(f"**{start_local:%a %d %b %H:%M} → {end_local:%H:%M}** ({tz_me})")
+                                cc[0].markdown(f"**{label}** ({tz_me})")
                                 if cc[1].button("Request this slot", key=f"req_{s['id']}"):
-                                    appt_id = book_slot(s["id"], host_id=host_id, guest_id=user.id)
-                                    if appt_id:
+                                    appt = book_slot(s["id"], host_id=host_id, guest_id=user.id)
+                                    if appt:
                                         st.success("Requested! Host needs to confirm.")
                                         st.session_state["book_host"] = None
                                         st.rerun()
@@ -140,10 +145,20 @@ def render(user):
             "Select Recommendation Type:",
             ["Similar to Yourself", "Good at Your Weaknesses"],
             horizontal=True,
+            key="tab3_rec_mode",
         )
         rec_mode_key = "similar" if rec_mode == "Similar to Yourself" else "complement"
 
-        recs = recommend_partners(user.id, mode=rec_mode_key)
+        prefer_overlap = st.checkbox(
+            "Prefer partners whose open slots overlap mine",
+            key="tab3_prefer_overlap",
+        )
+
+        # A wider candidate pool lets matching availability move partners up
+        recs = recommend_partners(user.id, mode=rec_mode_key, top_k=15 if prefer_overlap else 5)
+        windows = mutual_availability(user.id, [u["id"] for u in recs])
+        if prefer_overlap:
+            recs = apply_availability_bonus(recs, windows, top_k=5)
 
         if not recs:
             st.warning("No recommendations available yet. Try after receiving feedback!")
@@ -151,7 +166,16 @@ def render(user):
 
         st.write(f"### 👥 Top {len(recs)} Suggested Partners — *{rec_mode}*")
 
-        for i, u in enumerate(recs[:5], 1):
+        # Soonest open slots across all suggested partners (one index lookup)
+        upcoming = next_open_slots([u["id"] for u in recs], n=5)
+        if upcoming:
+            tz_me = (get_user_profile(user.id, "timezone") or {}).get("timezone") or "Europe/Paris"
+            names = {u["id"]: u.get("name") or u.get("email","").split("@")[0] for u in recs}
+            with st.expander("🗓️ Next open slots among your suggestions", expanded=False):
+                for s, label in zip(upcoming, slot_labels(upcoming, tz_me, end_key=None)):
+                    st.markdown(f"**{label}** ({tz_me}) · {names.get(s['user_id'], '—')}")
+
+        for i, u in enumerate(recs, 1):
             title_name = u.get("name") or u.get("email","").split("@")[0]
             with st.expander(f"{i}. {title_name} ({u.get('language') or 'N/A'})"):
                 st.markdown(f"**Experience level:** {u.get('experience_level') or '—'}")
@@ -160,6 +184,11 @@ def render(user):
                 firms = ", ".join(u.get("firms_applying", []) or [])
                 st.markdown(f"**Firms:** {firms or '—'}")
                 st.markdown(f"**Availability:** {u.get('availability') or '—'}")
+                common = windows.get(u["id"], [])
+                if common:
+                    tz_me = (get_user_profile(user.id, "timezone") or {}).get("timezone") or "Europe/Paris"
+                    shown = ", ".join(slot_labels(common[:3], tz_me, start_key="start", end_key="end"))
+                    st.markdown(f"**🤝 Common open windows ({len(common)}):** {shown}")
                 bio = u.get("bio")
                 if bio:
                     st.info(bio)
@@ -180,19 +209,17 @@ def render(user):
                     st.info("Select an available slot below:")
                     slots = get_bookable_slots_for_host(host_id)
 
-                    tz_me = (get_user_profile(user.id) or {}).get("timezone") or "Europe/Paris"
+                    tz_me = (get_user_profile(user.id, "timezone") or {}).get("timezone") or "Europe/Paris"
 
                     if not slots:
                         st.caption("No open slots.")
                     else:
-                        for s in slots:
-                            start_local = datetime.fromisoformat(s["start_ts"].replace("Z","+00:00")).astimezone(ZoneInfo(tz_me))
-                            end_local   = datetime.fromisoformat(s["end_ts"].replace("Z","+00:00")).astimezone(ZoneInfo(tz_me))
+                        for s, label in zip(slots, slot_labels(slots, tz_me)):
                             cc = st.columns([3,2])
-                            cc[0].markdown(f"**{start_local:%a %d %b %H:%M} → {end_local:%H:%M}** ({tz_me})")
+                            cc[0].markdown(f"**{label}** ({tz_me})")
                             if cc[1].button("Request this slot", key=f"req_rec_{s['id']}"):
-                                appt_id = book_slot(s["id"], host_id=host_id, guest_id=user.id)
-                                if appt_id:
+                                appt = book_slot(s["id"], host_id=host_id, guest_id=user.id)
+                                if appt:
                                     st.success("Requested! Host needs to confirm.")
                                     st.session_state["book_host"] = None
                                     st.rerun()
@@ -1,11 +1,15 @@
 import streamlit as st
 from app.core.db import (
-    supabase,
-    get_feedback_for_user,
     update_feedback_status,
-    insert_feedback
+    update_feedback_statuses,
+    insert_feedback,
+    get_pending_feedback,
+    search_users,
+    search_cases,
 )
 
+PICKER_LIMIT = 20
+
 def render(user):
     st.header("📝 Feedback Input & Validation")
 
@@ -15,23 +19,27 @@ def render(user):
     with tab1:
         st.subheader("Give Feedback")
 
-        # Get available users & cases
-        users_res = supabase.table("users").select("id, name, email").neq("id", user.id).execute()
-        cases_res = supabase.table("cases").select("id, title").execute()
+        # Search-as-you-type: each keystroke is one cached, limited lookup
+        c1, c2 = st.columns(2)
+        user_q = c1.text_input("Search partner (name or email)", key="tab4_partner_q")
+        case_q = c2.text_input("Search case (title)", key="tab4_case_q")
+        users = [u for u in search_users(user_q, PICKER_LIMIT + 1) if u["id"] != user.id][:PICKER_LIMIT]
+        cases = search_cases(case_q, PICKER_LIMIT)
 
-        if not users_res.data or not cases_res.data:
-            st.warning("⚠️ No users or cases found in the database.")
-            return
+        if not users or not cases:
+            # no early return: the review tab below must still render
+            st.warning("⚠️ No matching partners or cases — try another search.")
 
         # --- Prepare users and cases lists with placeholder ---
-        users_options = [{"id": None, "name": "👉 Please choose a partner", "email": ""}] + users_res.data
-        cases_options = [{"id": None, "title": "👉 Please choose a case"}] + cases_res.data
+        users_options = [{"id": None, "name": "👉 Please choose a partner", "email": ""}] + users
+        cases_options = [{"id": None, "title": "👉 Please choose a case"}] + cases
 
         # --- Select partner ---
         to_user = st.selectbox(
             "Select partner to give feedback to:",
             options=users_options,
             format_func=lambda u: f"{u['name']} ({u['email']})" if u["id"] else u["name"],
+            key="tab4_partner",
         )
 
         # --- Select case ---
@@ -39,6 +47,7 @@ def render(user):
             "Select case practiced:",
             options=cases_options,
             format_func=lambda c: c["title"],
+            key="tab4_case",
         )
 
         # --- Optional validation before proceeding ---
@@ -48,9 +57,9 @@ def render(user):
             # Skill ratings
             st.write("### Rate the skills (1–5)")
             skills = ["Estimation", "Framework", "Brainstorming", "Chart Interpretation", "Numerical Calculations"]
-            skill_scores = {skill: st.slider(skill, 1, 5, 3) for skill in skills}
+            skill_scores = {skill: st.slider(skill, 1, 5, 3, key=f"tab4_skill_{skill}") for skill in skills}
 
-            comments = st.text_area("Comments (optional)")
+            comments = st.text_area("Comments (optional)", key="tab4_comments")
 
             if st.button("Submit Feedback"):
                 insert_feedback(
@@ -67,32 +76,29 @@ def render(user):
     with tab2:
         st.subheader("Feedback Awaiting Your Approval")
 
-        pending = (
-            supabase.table("feedback")
-            .select("id, from_user, case_id, skill_scores, comments, created_at")
-            .eq("to_user", user.id)
-            .eq("status", "pending")
-            .execute()
-            .data
-        )
+        pending = get_pending_feedback(user.id)
 
         if not pending:
             st.info("No pending feedback at the moment.")
         else:
-            # Preload mapping for names and case titles
-            user_map = {
-                u["id"]: u["name"]
-                for u in supabase.table("users").select("id, name").execute().data
-            }
-            case_map = {
-                c["id"]: c["title"]
-                for c in supabase.table("cases").select("id, title").execute().data
-            }
+            c_all, c_sel = st.columns(2)
+            if c_all.button(f"✅ Accept all ({len(pending)})", key="accept_all"):
+                n = update_feedback_statuses([fb["id"] for fb in pending], "accepted")
+                st.success(f"Accepted {n} feedback entries ✅")
+                st.rerun()
+            selected = [fb["id"] for fb in pending if st.session_state.get(f"tab4_select_{fb['id']}")]
+            if c_sel.button(f"❌ Reject selected ({len(selected)})", disabled=not selected, key="reject_selected"):
+                n = update_feedback_statuses(selected, "rejected")
+                st.warning(f"Rejected {n} feedback entries ❌")
+                st.rerun()
 
             for fb in pending:
-                from_name = user_map.get(fb["from_user"], fb["from_user"])
-                case_title = case_map.get(fb["case_id"], fb["case_id"])
+                sender = fb.get("sender") or {}
+                from_name = sender.get("name") or sender.get("email") or fb["from_user"]
+                case_title = (fb.get("case") or {}).get("title") or fb["case_id"]
 
+                st.markdown("---")
+                st.checkbox("Select", key=f"tab4_select_{fb['id']}")
                 st.markdown(f"**🧑 From:** {from_name}")
                 st.markdown(f"**💼 Case:** {case_title}")
                 st.caption(f"🕒 Submitted on: {fb['created_at'][:16]}")
@@ -118,4 +124,3 @@ def render(user):
                         update_feedback_status(fb["id"], "rejected")
                         st.warning("Rejected feedback ❌")
                         st.rerun()
-
@@ -0,0 +1,95 @@
+# benchmarks/bench_feedback_decode.py
+"""Micro-benchmark: typed feedback decoder vs. the previous json_normalize one.
+
+Run from the repository root:
+
+    python benchmarks/bench_feedback_decode.py [--sizes 20 200 2000] [--repeat 5]
+
+Checks that both decoders produce the same frame (columns, dates, ratings)
+before timing them on synthetic accepted-feedback rows. No backend is used.
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+import types
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The decoder never touches the backend; importing app.core needs a client though
+try:
+    import supabase  # noqa: F401
+    from supabase import create_client  # noqa: F401
+except ImportError:
+    sys.modules["supabase"] = types.SimpleNamespace(create_client=lambda url, key: None, Client=object)
+try:
+    st.secrets["supabase"]
+except Exception:
+    st.secrets = {"supabase": {"url": "http://localhost", "key": "bench"}}
+
+from app.core.analytics_utils import ALL_SKILLS, feedback_to_dataframe  # noqa: E402
+
+
+def json_normalize_decoder(feedback_data: list):
+    """The decoder feedback_to_dataframe replaced (pd.json_normalize based)."""
+    if not feedback_data:
+        return pd.DataFrame()
+
+    df = pd.json_normalize(feedback_data)
+    df.columns = [c.replace("skill_scores.", "") for c in df.columns]
+    df.rename(columns={"created_at": "Date"}, inplace=True)
+    df["Date"] = pd.to_datetime(df["Date"]).dt.date
+    return df
+
+
+def make_feedback(n: int, rng: random.Random) -> list:
+    """n rows shaped like get_user_feedback's (some skills unrated, one extra skill)."""
+    skills = ALL_SKILLS + ["Synthesis"]
+    return [
+        {
+            "skill_scores": {s: rng.randint(1, 5) for s in skills if rng.random() < 0.85},
+            "created_at": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:10:00.{rng.randint(0, 999999):06d}+00:00",
+            "case_id": f"c{rng.randint(1, 50)}",
+        }
+        for _ in range(n)
+    ]
+
+
+def check_equivalent(rows: list):
+    old, new = json_normalize_decoder(rows), feedback_to_dataframe(rows)
+    assert list(old.columns) == list(new.columns), (list(old.columns), list(new.columns))
+    assert list(old["Date"]) == [d.date() for d in new["Date"]]
+    assert list(old["case_id"]) == list(new["case_id"])
+    for col in old.columns.drop(["Date", "case_id"]):
+        assert np.allclose(old[col].astype(float), new[col].astype(float), equal_nan=True), col
+
+
+def best_time(func, rows, number, repeat) -> float:
+    return min(timeit.repeat(lambda: func(rows), number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    print(f"{'rows':>6}  {'json_normalize':>15}  {'typed':>10}  {'speedup':>7}")
+    for n in args.sizes:
+        rows = make_feedback(n, rng)
+        check_equivalent(rows)
+        old = best_time(json_normalize_decoder, rows, args.number, args.repeat)
+        new = best_time(feedback_to_dataframe, rows, args.number, args.repeat)
+        print(f"{n:>6}  {old * 1e3:>12.2f} ms  {new * 1e3:>7.2f} ms  {old / new:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
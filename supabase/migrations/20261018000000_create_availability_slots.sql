@@ -0,0 +1,61 @@
+-- Bulk slot creation with dedupe and overlap rejection, in one round trip.
+-- Called as supabase.rpc("create_availability_slots",
+--     {"p_user_id": ..., "p_starts": [...], "p_minutes": 90}).
+-- Runs as the caller (security invoker), so the table's RLS policies still
+-- decide who may insert slots for p_user_id, as for a direct insert. The
+-- app's shared client carries no user session, so the owner is passed
+-- explicitly; it must be a known user and, when the request is signed in,
+-- the caller. New slots last p_minutes (the app's SLOT_MINUTES); existing
+-- slots are compared by their own end_ts. Rows are handled in start order
+-- inside one transaction, so a batch cannot overlap itself.
+
+create or replace function public.create_availability_slots(
+    p_user_id uuid,
+    p_starts timestamptz[],
+    p_minutes integer default 90
+)
+returns table (start_ts timestamptz, outcome text, slot_id uuid)
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_start timestamptz;
+    v_len interval := make_interval(mins => p_minutes);
+begin
+    if p_user_id is null or not exists (select 1 from users u where u.id = p_user_id) then
+        raise exception 'unknown user %', p_user_id;
+    end if;
+    if auth.uid() is not null and auth.uid() <> p_user_id then
+        raise exception 'cannot create slots for another user';
+    end if;
+
+    for v_start in select distinct s from unnest(p_starts) as s order by s loop
+        start_ts := v_start;
+        slot_id := null;
+
+        if v_start <= now() then
+            outcome := 'past';
+        elsif exists (
+            select 1 from availability_slots a
+            where a.user_id = p_user_id and a.start_ts = v_start
+        ) then
+            outcome := 'duplicate';
+        elsif exists (
+            select 1 from availability_slots a
+            where a.user_id = p_user_id
+              and a.start_ts < v_start + v_len
+              and a.end_ts > v_start
+        ) then
+            outcome := 'overlap';
+        else
+            insert into availability_slots (user_id, start_ts)
+            values (p_user_id, v_start)
+            returning id into slot_id;
+            outcome := 'created';
+        end if;
+
+        return next;
+    end loop;
+end;
+$$;
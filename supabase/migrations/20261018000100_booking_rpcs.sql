@@ -0,0 +1,78 @@
+-- Atomic booking and cancellation, one round trip each.
+-- Both return the appointment row with its slot embedded under
+-- "availability_slots" (the shape the appointment feed selects), or null
+-- when nothing changed (slot already taken / appointment not cancellable).
+-- Both run as the caller (security invoker), so the RLS policies on
+-- availability_slots and appointments authorize the writes as they did for
+-- the direct updates these replace. The app's shared client carries no user
+-- session, so the acting user is passed explicitly; it must be a known user
+-- and, when the request is signed in, the caller.
+
+create or replace function public.book_slot(p_slot_id uuid, p_guest_id uuid, p_notes text default '')
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_slot availability_slots;
+    v_appt appointments;
+begin
+    if p_guest_id is null or not exists (select 1 from users u where u.id = p_guest_id) then
+        raise exception 'unknown user %', p_guest_id;
+    end if;
+    if auth.uid() is not null and auth.uid() <> p_guest_id then
+        raise exception 'cannot book for another user';
+    end if;
+
+    update availability_slots
+       set is_booked = true
+     where id = p_slot_id and is_booked = false
+    returning * into v_slot;
+    if not found then
+        return null;
+    end if;
+
+    insert into appointments (slot_id, host_id, guest_id, status, notes)
+    values (v_slot.id, v_slot.user_id, p_guest_id, 'pending', coalesce(p_notes, ''))
+    returning * into v_appt;
+
+    return to_jsonb(v_appt) || jsonb_build_object('availability_slots', to_jsonb(v_slot));
+end;
+$$;
+
+create or replace function public.cancel_appointment(p_appt_id uuid, p_actor_id uuid)
+returns jsonb
+language plpgsql
+security invoker
+set search_path = public
+as $$
+declare
+    v_slot availability_slots;
+    v_appt appointments;
+begin
+    if p_actor_id is null then
+        raise exception 'unknown user';
+    end if;
+    if auth.uid() is not null and auth.uid() <> p_actor_id then
+        raise exception 'cannot cancel for another user';
+    end if;
+
+    update appointments
+       set status = 'cancelled'
+     where id = p_appt_id
+       and status in ('pending', 'confirmed')
+       and p_actor_id in (host_id, guest_id)
+    returning * into v_appt;
+    if not found then
+        return null;
+    end if;
+
+    update availability_slots
+       set is_booked = false
+     where id = v_appt.slot_id
+    returning * into v_slot;
+
+    return to_jsonb(v_appt) || jsonb_build_object('availability_slots', to_jsonb(v_slot));
+end;
+$$;
@@ -0,0 +1,89 @@
+# tests/conftest.py
+
+import os
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeQuery:
+    """Chainable stand-in for a postgrest request builder.
+
+    eq / neq / in_ filter the rows, range() slices them and update() writes
+    to the matching rows; every other builder method is accepted and ignored.
+    execute() is logged on the client.
+    """
+
+    def __init__(self, client, table):
+        self._client, self._table = client, table
+        self._filters, self._range, self._update = [], None, None
+
+    def update(self, values):
+        self._update = values
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def neq(self, column, value):
+        self._filters.append(lambda r: r.get(column) != value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self._filters.append(lambda r: r.get(column) in values)
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end + 1)
+        return self
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self._client.calls.append(self._table)
+        matched = [r for r in self._client.tables.get(self._table, []) if all(f(r) for f in self._filters)]
+        if self._update is not None:
+            for r in matched:
+                r.update(self._update)
+        rows = [dict(r) for r in matched]
+        if self._range:
+            rows = rows[self._range[0]:self._range[1]]
+        return SimpleNamespace(data=rows)
+
+
+class FakeSupabase:
+    """In-memory tables plus a log of the tables each execute() hit."""
+
+    def __init__(self):
+        self.tables, self.calls = {}, []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, fn, params=None):
+        return FakeQuery(self, f"rpc:{fn}")
+
+
+FAKE_SUPABASE = FakeSupabase()
+
+# The real client is not needed (nor installed) for the tests
+sys.modules["supabase"] = types.SimpleNamespace(create_client=lambda url, key: FAKE_SUPABASE, Client=FakeSupabase)
+st.secrets = {"supabase": {"url": "http://localhost", "key": "test"}}
+
+
+@pytest.fixture
+def backend():
+    """The fake Supabase backend, emptied, with all Streamlit caches cleared."""
+    FAKE_SUPABASE.tables, FAKE_SUPABASE.calls = {}, []
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    st.session_state.clear()
+    return FAKE_SUPABASE
@@ -0,0 +1,110 @@
+# tests/local_rpc.py
+
+import copy
+import threading
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+class _Call:
+    def __init__(self, fn, params):
+        self._fn, self._params = fn, params
+
+    def execute(self):
+        return SimpleNamespace(data=self._fn(**self._params))
+
+
+class LocalSchedulingRPC:
+    """In-memory stand-in for the scheduling RPCs in supabase/migrations.
+
+    Mirrors create_availability_slots, book_slot and cancel_appointment,
+    including their return shapes and participant checks, so scheduling
+    code can be exercised without a database: patch it in where
+    `supabase.rpc(...)` is called. uid plays auth.uid(): None (the app's
+    shared, session-less client) or the signed-in caller.
+    """
+
+    def __init__(self, uid: Optional[str] = None):
+        self.uid = uid
+        self.slots: Dict[str, dict] = {}
+        self.appointments: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def rpc(self, fn: str, params: Optional[dict] = None) -> _Call:
+        return _Call(getattr(self, f"_{fn}"), params or {})
+
+    def _create_availability_slots(self, p_user_id: str, p_starts: List[str], p_minutes: int = 90) -> List[dict]:
+        self._check_caller(p_user_id)
+        length = pd.Timedelta(minutes=p_minutes)
+        now = pd.Timestamp.now(tz="UTC")
+        out = []
+        with self._lock:
+            for start in sorted({pd.Timestamp(s).tz_convert("UTC") for s in p_starts}):
+                mine = [
+                    (pd.Timestamp(s["start_ts"]), pd.Timestamp(s["end_ts"]))
+                    for s in self.slots.values() if s["user_id"] == p_user_id
+                ]
+                slot_id = None
+                if start <= now:
+                    outcome = "past"
+                elif any(m_start == start for m_start, _ in mine):
+                    outcome = "duplicate"
+                elif any(m_start < start + length and m_end > start for m_start, m_end in mine):
+                    outcome = "overlap"
+                else:
+                    slot_id = str(uuid.uuid4())
+                    self.slots[slot_id] = {
+                        "id": slot_id,
+                        "user_id": p_user_id,
+                        "start_ts": start.isoformat(),
+                        "end_ts": (start + length).isoformat(),
+                        "is_booked": False,
+                    }
+                    outcome = "created"
+                out.append({"start_ts": start.isoformat(), "outcome": outcome, "slot_id": slot_id})
+        return out
+
+    def _check_caller(self, user_id):
+        if user_id is None:
+            raise ValueError("unknown user")
+        if self.uid is not None and self.uid != user_id:
+            raise PermissionError("cannot act for another user")
+
+    def _book_slot(self, p_slot_id: str, p_guest_id: str, p_notes: str = "") -> Optional[dict]:
+        self._check_caller(p_guest_id)
+        with self._lock:
+            slot = self.slots.get(p_slot_id)
+            if slot is None or slot["is_booked"]:
+                return None
+            slot["is_booked"] = True
+            appt = {
+                "id": str(uuid.uuid4()),
+                "slot_id": p_slot_id,
+                "host_id": slot["user_id"],
+                "guest_id": p_guest_id,
+                "status": "pending",
+                "notes": p_notes or "",
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self.appointments[appt["id"]] = appt
+            return dict(copy.deepcopy(appt), availability_slots=copy.deepcopy(slot))
+
+    def _cancel_appointment(self, p_appt_id: str, p_actor_id: str) -> Optional[dict]:
+        self._check_caller(p_actor_id)
+        with self._lock:
+            appt = self.appointments.get(p_appt_id)
+            if (
+                appt is None
+                or appt["status"] not in ("pending", "confirmed")
+                or p_actor_id not in (appt["host_id"], appt["guest_id"])
+            ):
+                return None
+            appt["status"] = "cancelled"
+            slot = self.slots.get(appt["slot_id"])
+            if slot is not None:
+                slot["is_booked"] = False
+            return dict(copy.deepcopy(appt), availability_slots=copy.deepcopy(slot))
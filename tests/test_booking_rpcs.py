@@ -0,0 +1,78 @@
+# tests/test_booking_rpcs.py
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import app.core.scheduling as scheduling
+from app.core.slot_index import get_slot_index
+from local_rpc import LocalSchedulingRPC
+
+HOST, GUEST, OTHER = "host-1", "guest-1", "other-1"
+
+
+@pytest.fixture
+def rpc(backend, monkeypatch):
+    """Scheduling RPCs served in memory, called like the app's shared (session-less) client."""
+    local = LocalSchedulingRPC()
+    monkeypatch.setattr(scheduling, "supabase", local)
+    return local
+
+
+def _open_slot(rpc):
+    start = (datetime.now() + timedelta(days=3)).replace(hour=19, minute=0, second=0, microsecond=0)
+    outcomes = scheduling.add_slots(HOST, [start], "Europe/Paris")
+    assert [o["outcome"] for o in outcomes] == ["created"]
+    return outcomes[0]["slot_id"]
+
+
+def test_add_slots_reports_duplicates_and_overlaps(rpc):
+    start = (datetime.now() + timedelta(days=3)).replace(hour=19, minute=0, second=0, microsecond=0)
+    scheduling.add_slots(HOST, [start], "Europe/Paris")
+
+    outcomes = scheduling.add_slots(HOST, [start, start + timedelta(minutes=30), start + timedelta(hours=2)], "Europe/Paris")
+
+    assert scheduling.summarize_outcomes(outcomes) == {"created": 1, "duplicate": 1, "overlap": 1, "past": 0}
+    assert len(get_slot_index().for_host(HOST)) == 2
+
+
+def test_book_returns_the_appointment_row(rpc):
+    slot_id = _open_slot(rpc)
+
+    appt = scheduling.book_slot(slot_id, host_id=HOST, guest_id=GUEST)
+
+    assert appt["status"] == "pending"
+    assert (appt["host_id"], appt["guest_id"]) == (HOST, GUEST)
+    assert appt["availability_slots"]["id"] == slot_id
+    assert rpc.slots[slot_id]["is_booked"]
+    assert get_slot_index().for_host(HOST) == []
+
+
+def test_double_booking_is_rejected(rpc):
+    slot_id = _open_slot(rpc)
+    scheduling.book_slot(slot_id, host_id=HOST, guest_id=GUEST)
+
+    assert scheduling.book_slot(slot_id, host_id=HOST, guest_id=OTHER) is None
+    assert len(rpc.appointments) == 1
+
+
+def test_cancel_frees_the_slot(rpc):
+    slot_id = _open_slot(rpc)
+    appt = scheduling.book_slot(slot_id, host_id=HOST, guest_id=GUEST)
+
+    cancelled = scheduling.update_appointment_status(appt["id"], "cancelled", GUEST)
+
+    assert cancelled["status"] == "cancelled"
+    assert not rpc.slots[slot_id]["is_booked"]
+    assert [s["id"] for s in get_slot_index().for_host(HOST)] == [slot_id]
+    # a second cancel changes nothing
+    assert scheduling.update_appointment_status(appt["id"], "cancelled", GUEST) is None
+
+
+def test_only_participants_can_cancel(rpc):
+    slot_id = _open_slot(rpc)
+    appt = scheduling.book_slot(slot_id, host_id=HOST, guest_id=GUEST)
+
+    assert scheduling.update_appointment_status(appt["id"], "cancelled", OTHER) is None
+    assert rpc.appointments[appt["id"]]["status"] == "pending"
+    assert rpc.slots[slot_id]["is_booked"]
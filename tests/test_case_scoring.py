@@ -0,0 +1,61 @@
+# tests/test_case_scoring.py
+
+import random
+
+import numpy as np
+import pytest
+
+from app.core.analytics_utils import ALL_SKILLS
+from app.core.recommendations_cases import _score_cases, get_case_index
+
+EXTRA_SKILLS = ["Synthesis"]
+STYLES = ["Interviewer-led", "Candidate-led"]
+
+
+# Per-case reference formula the weight-matrix scorer replaced
+def compute_case_score(user_avgs: dict, case: dict, mode: str):
+    """Compute a weighted score for a given case based on user skill averages."""
+    skill_weights = case.get("skill_weights", {}) or {}
+    score = 0
+    for skill, weight in skill_weights.items():
+        user_rating = user_avgs.get(skill, 3)
+        if mode == "fix_weaknesses":
+            score += weight * (5 - user_rating)
+        else:  # build_strengths
+            score += weight * user_rating
+    return score
+
+
+def _cases(n):
+    rng = random.Random(8)
+    skills = ALL_SKILLS + EXTRA_SKILLS
+    return [
+        {
+            "id": f"c{i:03d}",
+            "title": f"Case {i}",
+            "case_style": rng.choice(STYLES + [None]),
+            # some cases carry no weights at all
+            "skill_weights": {s: rng.uniform(0, 1) for s in rng.sample(skills, rng.randint(0, 3))} or None,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("mode", ["fix_weaknesses", "build_strengths"])
+@pytest.mark.parametrize("pref_style", [None, "Candidate-led", "Unknown"])
+def test_score_cases_matches_per_case_formula(backend, mode, pref_style):
+    cases = _cases(60)
+    backend.tables["cases"] = cases
+    index = get_case_index()
+    rng = random.Random(4)
+
+    for _ in range(20):
+        user_avgs = {s: rng.uniform(1, 5) for s in rng.sample(index[1], rng.randint(0, len(index[1])))}
+        ratings = [user_avgs.get(s, 3) for s in index[1]]
+
+        top = _score_cases(index, ratings, mode, 5, pref_style)
+
+        pool = [c for c in cases if not pref_style or c["case_style"] == pref_style]
+        reference = sorted(pool, key=lambda c: compute_case_score(user_avgs, c, mode), reverse=True)[:5]
+        assert [c["id"] for c in top] == [c["id"] for c in reference]
+        assert np.allclose([c["score"] for c in top], [compute_case_score(user_avgs, c, mode) for c in reference])
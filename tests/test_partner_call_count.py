@@ -0,0 +1,45 @@
+# tests/test_partner_call_count.py
+
+from app.core.recommendations_partners import recommend_partners
+
+SKILLS = ["Estimation", "Framework", "Brainstorming"]
+
+
+def _populate(backend, n_users):
+    backend.tables["users"] = [
+        {"id": f"u{i:03d}", "name": f"User {i}", "email": f"u{i}@hec.edu", "language": "English"}
+        for i in range(n_users)
+    ]
+    backend.tables["feedback"] = [
+        {"id": f"f{i:03d}-{k}", "to_user": f"u{i:03d}", "status": "accepted",
+         "skill_scores": {s: 1 + (i + j) % 5 for j, s in enumerate(SKILLS)}}
+        for i in range(n_users)
+        for k in range(3)
+    ]
+
+
+def test_recommendation_request_makes_two_backend_calls(backend):
+    _populate(backend, 50)
+
+    recs = recommend_partners("u000", mode="similar", top_k=5)
+
+    assert len(recs) == 5
+    assert sorted(backend.calls) == ["feedback", "users"]
+
+
+def test_call_count_does_not_grow_with_users(backend):
+    _populate(backend, 300)  # 900 feedback rows: still one page
+
+    recommend_partners("u000", mode="complement", top_k=5)
+
+    assert sorted(backend.calls) == ["feedback", "users"]
+
+
+def test_other_users_reuse_the_shared_tables(backend):
+    _populate(backend, 50)
+    recommend_partners("u000")
+    backend.calls.clear()
+
+    recommend_partners("u001")
+
+    assert backend.calls == []
@@ -0,0 +1,108 @@
+# tests/test_partner_scoring.py
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.analytics_utils import ALL_SKILLS, feedback_to_dataframe
+from app.core.recommendations_partners import recommend_partners, score_candidates
+
+EXTRA_SKILLS = ["Synthesis", "Market Sizing"]
+
+
+# Pairwise reference formulas the vectorized scorer replaced
+def compute_skill_averages(feedback_df: pd.DataFrame):
+    """Compute per-skill averages from a feedback dataframe."""
+    if feedback_df.empty:
+        return {}, []
+
+    skill_cols = [c for c in feedback_df.columns if c not in ["Date", "case_id", "Case"]]
+    skill_avgs = feedback_df[skill_cols].astype(float).mean().to_dict()
+    for s in ALL_SKILLS:
+        skill_avgs.setdefault(s, 3.0)
+    return skill_avgs, skill_cols
+
+
+def compute_similarity(user_a_skills, user_b_skills):
+    """Compute similarity between two users' skill vectors."""
+    skills = list(set(user_a_skills.keys()) | set(user_b_skills.keys()))
+    a = np.array([user_a_skills.get(s, 3) for s in skills])
+    b = np.array([user_b_skills.get(s, 3) for s in skills])
+    num = np.dot(a, b)
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(num / denom) if denom else 0.0
+
+
+def compute_complementarity(user_a_skills, user_b_skills):
+    """Compute how much user B complements user A's weaknesses."""
+    skills = list(set(user_a_skills.keys()) | set(user_b_skills.keys()))
+    complement = 0
+    for s in skills:
+        complement += (5 - user_a_skills.get(s, 3)) * user_b_skills.get(s, 3)
+    return complement / len(skills)
+
+
+def _random_skills(rng):
+    skills = ALL_SKILLS + EXTRA_SKILLS
+    return {s: rng.uniform(0, 5) for s in rng.sample(skills, rng.randint(1, len(skills)))}
+
+
+@pytest.mark.parametrize("mode", ["similar", "complement"])
+def test_score_candidates_matches_pairwise_formulas(mode):
+    rng = random.Random(11)
+    skills = ALL_SKILLS + EXTRA_SKILLS
+    for _ in range(50):
+        me = _random_skills(rng)
+        others = [_random_skills(rng) for _ in range(rng.randint(1, 20))]
+        counts = np.array([rng.randint(0, 9) for _ in others])
+
+        values = np.array([[u.get(s, 3.0) for s in skills] for u in others])
+        rated = np.array([[s in u for s in skills] for u in others])
+        current = np.array([me.get(s, 3.0) for s in skills])
+        current_rated = np.array([s in me for s in skills])
+
+        scores = score_candidates(values, rated, current, current_rated, mode, case_counts=counts)
+
+        if mode == "similar":
+            expected = [compute_similarity(me, u) + 0.05 * n for u, n in zip(others, counts)]
+        else:
+            expected = [compute_complementarity(me, u) for u in others]
+        assert np.allclose(scores, expected)
+
+
+@pytest.mark.parametrize("mode", ["similar", "complement"])
+def test_recommend_partners_matches_reference_ranking(backend, mode):
+    rng = random.Random(3)
+    user_ids = [f"u{i:02d}" for i in range(30)]
+    backend.tables["users"] = [{"id": uid, "name": uid} for uid in user_ids]
+    feedback = {
+        uid: [
+            {"skill_scores": _random_skills(rng), "created_at": "2025-03-01T10:00:00+00:00", "case_id": "c1"}
+            for _ in range(rng.randint(1, 4))
+        ]
+        for uid in user_ids[:-3]  # the last three users have no feedback
+    }
+    backend.tables["feedback"] = [
+        {"id": f"{uid}-{k}", "to_user": uid, "status": "accepted", **fb}
+        for uid, rows in feedback.items()
+        for k, fb in enumerate(rows)
+    ]
+
+    recs = recommend_partners("u00", mode=mode, top_k=10)
+
+    avgs = {uid: compute_skill_averages(feedback_to_dataframe(rows))[0] for uid, rows in feedback.items()}
+    reference = []
+    for uid in user_ids[1:]:
+        if uid not in avgs:
+            continue
+        if mode == "similar":
+            score = compute_similarity(avgs["u00"], avgs[uid]) + 0.05 * len(feedback[uid])
+        else:
+            score = compute_complementarity(avgs["u00"], avgs[uid])
+        reference.append((uid, score))
+    reference = sorted(reference, key=lambda r: r[1], reverse=True)[:10]
+
+    assert [r["id"] for r in recs] == [uid for uid, _ in reference]
+    assert np.allclose([r["score"] for r in recs], [score for _, score in reference], rtol=1e-5)
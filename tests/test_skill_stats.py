@@ -0,0 +1,38 @@
+# tests/test_skill_stats.py
+
+from app.core.db import update_feedback_statuses
+from app.core.skill_stats import get_skill_stats
+
+
+def _feedback(fid, to_user, status, scores):
+    return {"id": fid, "to_user": to_user, "from_user": "u9", "status": status, "skill_scores": scores}
+
+
+def test_accept_against_a_cold_store_counts_once(backend):
+    backend.tables["feedback"] = [
+        _feedback("f1", "u1", "accepted", {"Estimation": 2}),
+        _feedback("f2", "u1", "pending", {"Estimation": 4}),
+    ]
+
+    # nothing has built the store yet: it is rebuilt after the row is accepted
+    assert update_feedback_statuses(["f2"], "accepted") == 1
+
+    stats = get_skill_stats()
+    assert stats.feedback_count("u1") == 2
+    assert stats.summary("u1")["Estimation"]["count"] == 2
+    assert stats.averages("u1")["Estimation"] == 3.0
+
+
+def test_accept_against_a_warm_store_counts_once(backend):
+    backend.tables["feedback"] = [
+        _feedback("f1", "u1", "accepted", {"Estimation": 2}),
+        _feedback("f2", "u1", "pending", {"Estimation": 4}),
+    ]
+    assert get_skill_stats().feedback_count("u1") == 1
+
+    update_feedback_statuses(["f2"], "accepted")
+    update_feedback_statuses(["f2"], "accepted")
+
+    stats = get_skill_stats()
+    assert stats.feedback_count("u1") == 2
+    assert stats.summary("u1")["Estimation"] == {"count": 2, "mean": 3.0, "std": 1.0}
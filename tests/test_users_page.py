@@ -0,0 +1,52 @@
+# tests/test_users_page.py
+
+import random
+
+from app.core.recommendations_partners import get_users_page
+
+FIRMS = ["McKinsey", "BCG", "Bain", "Kearney"]
+
+
+def _users(n):
+    rng = random.Random(7)
+    return [
+        {
+            "id": f"{rng.getrandbits(32):08x}",
+            # few distinct timestamps, so the id tie-break matters
+            "created_at": f"2025-01-{rng.randint(1, 5):02d}T10:00:00+00:00",
+            "language": rng.choice(["English", "French"]),
+            "experience_level": rng.choice(["Beginner", "Advanced", None]),
+            "firms_applying": rng.sample(FIRMS, rng.randint(0, 3)),
+        }
+        for _ in range(n)
+    ]
+
+
+def _walk(page_size, **filters):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = get_users_page(**filters, before=cursor, page_size=page_size)
+        seen.extend(r["id"] for r in rows)
+        if cursor is None:
+            return seen
+
+
+def test_pages_follow_newest_first_keyset_order(backend):
+    users = _users(120)
+    backend.tables["users"] = users
+    me = users[0]["id"]
+
+    got = _walk(7, exclude_user_id=me, language="English", firms=("BCG",))
+
+    expected = sorted(
+        (u for u in users if u["id"] != me and u["language"] == "English" and "BCG" in u["firms_applying"]),
+        key=lambda u: (u["created_at"], u["id"]),
+        reverse=True,
+    )
+    assert got == [u["id"] for u in expected]
+
+
+def test_pages_come_from_the_shared_snapshot(backend):
+    backend.tables["users"] = _users(60)
+    _walk(10)
+    assert backend.calls == ["users"]